@@ -9,57 +9,66 @@ AN = 365*24*3600
 
 ### DEFINITION DES CORPS ###
 
-CentoriA = Body(Name = 'Centori A',
-              Position = np.array([[0.0],[0.0],[0.0]]),
-              Velocity = np.array([[0.0],[0.0],[0.0]]),
-              Mass = 1.1*MS,
-              Radius = 696340*1.227,
-              Temperature = 5800,
-              Albedo = 1,
-              Emissivity = 0.95,
-              Color = 'gold')
+def Create_System(r12=25, r13=60, r_planet=1):
+    """
+    Crée le système d'Alpha Centauri.
+    r12, r13 et r_planet sont les distances initiales de B, C et Proxima b à A [UA].
+    """
+    CentoriA = Body(Name = 'Centori A',
+                  Position = np.array([0.0,0.0,0.0]),
+                  Velocity = np.array([0.0,0.0,0.0]),
+                  Mass = 1.1*MS,
+                  Radius = 696340*1.227,
+                  Temperature = 5800,
+                  Albedo = 1,
+                  Emissivity = 0.95,
+                  Color = 'gold')
 
-r12 = 25 * UA
-v12 = np.sqrt(G * (CentoriA.Mass) / r12)
+    r12 = r12 * UA
+    v12 = np.sqrt(G * (CentoriA.Mass) / r12)
 
-CentoriB= Body(Name = 'Centori B',
-              Position = np.array([[r12],[0.0],[0.0]])*UA,
-              Velocity = np.array([[0.0],[v12],[0.0]]),
-              Mass = 0.907*MS,
-              Radius = 696340*0.865,
-              Temperature = 5260,
-              Albedo = 1,
-              Emissivity = 0.95,
-              Color = 'goldenrod')
+    CentoriB= Body(Name = 'Centori B',
+                  Position = np.array([r12,0.0,0.0])*UA,
+                  Velocity = np.array([0.0,v12,0.0]),
+                  Mass = 0.907*MS,
+                  Radius = 696340*0.865,
+                  Temperature = 5260,
+                  Albedo = 1,
+                  Emissivity = 0.95,
+                  Color = 'goldenrod')
 
-r13 = 60 * UA
-v13 = np.sqrt(G * (CentoriA.Mass + CentoriB.Mass) / r13)
+    r13 = r13 * UA
+    v13 = np.sqrt(G * (CentoriA.Mass + CentoriB.Mass) / r13)
 
-CentoriC = Body(Name = 'Centori C',
-              Position = np.array([[r13],[0.0],[0.0]])*UA,
-              Velocity = np.array([[0.0],[v13],[0.0]]),
-              Mass = 0.1221*MS,
-              Radius = 696340*0.1542,
-              Temperature = 3042,
-              Albedo = 1,
-              Emissivity = 0.95,
-              Color = 'darkred')
+    CentoriC = Body(Name = 'Centori C',
+                  Position = np.array([r13,0.0,0.0])*UA,
+                  Velocity = np.array([0.0,v13,0.0]),
+                  Mass = 0.1221*MS,
+                  Radius = 696340*0.1542,
+                  Temperature = 3042,
+                  Albedo = 1,
+                  Emissivity = 0.95,
+                  Color = 'darkred')
 
-r_planet = 1 * UA
-v_planet = np.sqrt(G * CentoriA.Mass / r_planet)
+    r_planet = r_planet * UA
+    v_planet = np.sqrt(G * CentoriA.Mass / r_planet)
 
-Proxima = Body(Name = 'Proxima b',
-            Position = np.array([[r_planet],[0.0],[0.0]])*UA,
-            Velocity = np.array([[0.0],[v_planet],[0.0]]),
-            Mass = 1.17*MT,
-            Radius = 1737.4,
-            Temperature = 250,
-            Albedo = 0.1054,
-            Emissivity = 0.95,
-            Color = 'blue')
+    Proxima = Body(Name = 'Proxima b',
+                Position = np.array([r_planet,0.0,0.0])*UA,
+                Velocity = np.array([0.0,v_planet,0.0]),
+                Mass = 1.17*MT,
+                Radius = 1737.4,
+                Temperature = 250,
+                Albedo = 0.1054,
+                Emissivity = 0.95,
+                Color = 'blue')
+
+    Trisolaris = System([CentoriA,CentoriB,CentoriC,Proxima])
+    return Trisolaris
 
 ### SIMULATION DU SYSTEME ###
 
-Trisolaris = System([CentoriA,CentoriB,CentoriC,Proxima])
-Trisolaris.Simulation(Time = 100*AN, Nb_step = 1000)
-Trisolaris.Animation(Animated_time = 5)
\ No newline at end of file
+if __name__ == '__main__':
+    Trisolaris = Create_System()
+    Trisolaris.Simulation(Time = 100*AN, Nb_step = 1000)
+    Trisolaris.Animation(Animated_time = 5)
@@ -1,18 +1,55 @@
+import os
+import json
+import time
+import queue
+import threading
+import importlib.util
 import numpy as np
-import matplotlib.pyplot as plt
-from tqdm import tqdm
-from matplotlib.animation import FuncAnimation
+from Barnes_Hut import Octree, Force_Error, Direct_field
+from Kepler import Kepler_drift
+from Trajectory_store import Trajectory_Store, Open_store, Read_header
+from Level_of_detail import Trail_LOD, Series_LOD, Ring_Buffer
+from Sinks import Queue_Sink
+from Profiling import Profiler
+
+# matplotlib, tqdm et Numba ne sont importés qu'à leur premier usage (affichage, barre de progression,
+# backend 'numba') : une simulation sans affichage ne paie pas leur chargement.
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
 
 ### CONSTANTES ###
 G = 6.6743015e-11  # Constante gravitationnelle [m3/kg/s2]
 YEAR = 365.25 * 24 * 3600  # Une année en secondes
+RADIATION_THRESHOLD = 1e-6  # Flux minimal d'un émetteur, relatif au flux total reçu par un récepteur
+
+### COEFFICIENTS DES INTEGRATEURS ###
+# Yoshida d'ordre 4 (forme kick-drift-kick : 4 kicks, 3 drifts)
+YOSHIDA_W1 = 1 / (2 - 2 ** (1 / 3))
+YOSHIDA_W0 = -2 ** (1 / 3) * YOSHIDA_W1
+YOSHIDA_KICKS = [YOSHIDA_W1 / 2, (YOSHIDA_W0 + YOSHIDA_W1) / 2, (YOSHIDA_W0 + YOSHIDA_W1) / 2, YOSHIDA_W1 / 2]
+YOSHIDA_DRIFTS = [YOSHIDA_W1, YOSHIDA_W0, YOSHIDA_W1]
+# Dormand-Prince 5(4)
+DOPRI_A = [[],
+           [1 / 5],
+           [3 / 40, 9 / 40],
+           [44 / 45, -56 / 15, 32 / 9],
+           [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+           [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+           [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]]
+DOPRI_E = [71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40]  # Ordre 5 - ordre 4
 
 ### CLASS BODY ###
 class Body:
     """
     Classe représentant un corps céleste.
+    Position, vitesse et force sont des vecteurs float64 (3,). Une fois le corps intégré à un System,
+    ce sont des vues sur la ligne Index des tableaux d'état du système, créées à la demande : le corps ne
+    conserve ni copie ni vue, et ses attributs sont déclarés dans __slots__ (pas de dictionnaire par instance).
     """
-    def __init__(self, Name, Position, Velocity, Mass, Radius, Temperature, Albedo, Emissivity, Color):
+    __slots__ = ('Name', 'Mass', 'Radius', 'Albedo', 'Emissivity', 'Temperature', 'Thermic_Radiation_Resultant',
+                 'Color', 'Emitter', 'Host', 'State', 'Index', 'Own_Position', 'Own_Velocity', 'Own_Force')
+
+    def __init__(self, Name, Position, Velocity, Mass, Radius, Temperature, Albedo, Emissivity, Color, Emitter=None):
+        self.State, self.Index = None, None  # Système dont les tableaux portent l'état du corps, et sa ligne
         self.Name = Name  # Nom du corps
         self.Position = Position  # Position initiale [km]
         self.Velocity = Velocity  # Vitesse initiale [km/s]
@@ -22,85 +59,616 @@ class Body:
         self.Emissivity = Emissivity  # Émissivité thermique
         self.Temperature = Temperature  # Température initiale [K]
         self.Thermic_Radiation_Resultant = 0  # Radiation thermique résultante
-        self.Force_Resultant = 0  # Force résultante due à la gravitation
+        self.Force_Resultant = np.zeros(3)  # Force résultante due à la gravitation [N]
+        self.Color = Color  # Couleur pour l'affichage
+        self.Emitter = Emitter  # Source de radiation : True, False, ou None (selon sa luminosité, voir System)
+        self.Host = None  # Corps qui l'a absorbé lors d'une collision (voir System.Merge)
+
+    def Attach(self, State, Index):
+        """
+        Confie l'état du corps à la ligne Index des tableaux de State (voir System.Pack_State).
+        """
+        self.State, self.Index = State, Index
+        self.Own_Position = self.Own_Velocity = self.Own_Force = None
+
+    @property
+    def Position(self):
+        return self.Own_Position if self.State is None else self.State.Positions[self.Index]
+
+    @Position.setter
+    def Position(self, value):
+        if self.State is None:
+            self.Own_Position = np.array(value, dtype=np.float64).reshape(3)
+        else:
+            self.State.Positions[self.Index] = np.reshape(value, 3)
+
+    @property
+    def Velocity(self):
+        return self.Own_Velocity if self.State is None else self.State.Velocities[self.Index]
+
+    @Velocity.setter
+    def Velocity(self, value):
+        if self.State is None:
+            self.Own_Velocity = np.array(value, dtype=np.float64).reshape(3)
+        else:
+            self.State.Velocities[self.Index] = np.reshape(value, 3)
+
+    @property
+    def Force_Resultant(self):
+        return self.Own_Force if self.State is None else self.State.Forces[self.Index]
+
+    @Force_Resultant.setter
+    def Force_Resultant(self, value):
+        if self.State is None:
+            self.Own_Force = np.array(value, dtype=np.float64).reshape(3)
+        else:
+            self.State.Forces[self.Index] = np.reshape(value, 3)
+
+### CLASS PARTICLES ###
+class Particles:
+    """
+    Population de particules test (ceinture d'astéroïdes, anneau) : sans masse, elles subissent la gravité
+    et la radiation des corps massifs sans agir sur eux. Positions et vitesses sont des tableaux (P,3) ;
+    une fois la population intégrée à un System, ce sont des vues sur les lignes Rows des tableaux d'état,
+    à la suite des corps massifs.
+    """
+    __slots__ = ('Name', 'Ids', 'Radius', 'Albedo', 'Emissivity', 'Color', 'State', 'Rows',
+                 'Own_Positions', 'Own_Velocities', 'Own_Temperatures')
+
+    def __init__(self, Name, Positions, Velocities, Radius, Temperature, Albedo, Emissivity, Color):
+        self.State, self.Rows = None, None  # Système dont les tableaux portent l'état, et ses lignes
+        self.Name = Name  # Nom de la population
+        self.Own_Positions = np.array(Positions, dtype=np.float64).reshape(-1, 3)  # Positions initiales [km]
+        self.Own_Velocities = np.array(Velocities, dtype=np.float64).reshape(-1, 3)  # Vitesses initiales [km/s]
+        P = len(self.Own_Positions)
+        self.Ids = np.arange(P)  # Numéro d'origine de chaque particule restante
+        self.Radius = np.broadcast_to(np.asarray(Radius, dtype=np.float64), (P,))  # Rayons [km]
+        self.Albedo = np.broadcast_to(np.asarray(Albedo, dtype=np.float64), (P,))
+        self.Emissivity = np.broadcast_to(np.asarray(Emissivity, dtype=np.float64), (P,))
+        self.Own_Temperatures = np.broadcast_to(np.asarray(Temperature, dtype=np.float64), (P,))  # [K]
         self.Color = Color  # Couleur pour l'affichage
 
+    def __len__(self):
+        return len(self.Own_Positions) if self.State is None else self.Rows.stop - self.Rows.start
+
+    def Attach(self, State, Rows):
+        """
+        Confie l'état de la population aux lignes Rows (slice) des tableaux de State (voir System.Pack_State).
+        """
+        self.State, self.Rows = State, Rows
+        self.Own_Positions = self.Own_Velocities = self.Own_Temperatures = None
+
+    def Detach(self, keep):
+        """
+        Reprend une copie de l'état des seules particules du masque keep (les autres sont retirées),
+        avant une reconstruction de l'état du système.
+        """
+        self.Own_Positions, self.Own_Velocities = self.Positions[keep].copy(), self.Velocities[keep].copy()
+        self.Own_Temperatures = self.Temperatures[keep].copy()
+        self.Ids, self.Radius, self.Albedo, self.Emissivity = (self.Ids[keep], self.Radius[keep],
+                                                               self.Albedo[keep], self.Emissivity[keep])
+        self.State, self.Rows = None, None
+
+    @property
+    def Positions(self):
+        return self.Own_Positions if self.State is None else self.State.Positions[self.Rows]
+
+    @property
+    def Velocities(self):
+        return self.Own_Velocities if self.State is None else self.State.Velocities[self.Rows]
+
+    @property
+    def Temperatures(self):
+        return self.Own_Temperatures if self.State is None else self.State.Body_Temperatures[self.Rows]
+
 ### CLASS SYSTEM ###
 class System:
     """
     Classe représentant un système de corps célestes et les lois physiques régissant leurs interactions.
     """
-    def __init__(self, Elements):
+    def __init__(self, Elements, engine='packed', backend='numpy', radiation_threshold=RADIATION_THRESHOLD,
+                 particles=()):
+        if particles and engine == 'loop':
+            raise ValueError("Les particules test nécessitent le moteur 'packed'")
         self.Elements = Elements  # Liste des corps du système
+        self.Bodies = list(Elements)  # Corps non absorbés par une collision, qui portent une ligne de l'état
+        self.Particles = list(particles)  # Populations de particules test (voir Particles)
+        self.Engine = engine  # Moteur de calcul : 'packed' (vectorisé) ou 'loop' (boucle de référence)
+        self.Backend = 'numpy'  # Noyaux du moteur 'packed' : 'numpy' ou 'numba' (compilés, parallèles)
+        self.Solver = 'direct'  # Solveur de gravité : 'direct' ou 'barnes-hut'
+        self.Theta = 0.5  # Angle d'ouverture du solveur de Barnes-Hut
+        self.Integrator = 'euler'  # Intégrateur : 'euler', 'leapfrog', 'yoshida4', 'rk45', 'block' ou 'wisdom-holman'
+        self.Tolerance = 1e-9  # Tolérance relative de l'intégrateur adaptatif
+        self.Adaptive_Step = None  # Dernier pas proposé par l'intégrateur adaptatif [s]
+        self.Force_Evaluations = 0  # Nombre d'évaluations des forces (en passes complètes équivalentes)
+        self.Eta = 0.02  # Paramètre de précision du pas individuel (pas par blocs)
+        self.Max_Level = 12  # Nombre maximal de subdivisions par deux du pas de sortie (pas par blocs)
+        self.Block_Levels = None  # Niveau de pas de chaque corps : dt = Time_step / 2**niveau
         self.Time = 0  # Temps initialisé à 0
         self.Trajectories = {}  # Dictionnaire pour stocker les trajectoires
         self.Temperatures = {}  # Dictionnaire pour stocker les températures
         self.animations = {}  # Dictionnaire pour stocker les animations
+        self.Radiation_Threshold = radiation_threshold  # Flux relatif minimal d'un émetteur
+        self.Profiler = None  # Profileur de la dernière simulation profilée (voir Profiling.py)
+        self.Set_Backend(backend)
         self.max_size = max([np.log(element.Radius) for element in Elements])
         self.min_size = min([np.log(element.Radius) for element in Elements])
+        self.Pack_State()
 
-    def Init_Data(self, Time, Nb_step):
+    def Pack_State(self):
         """
-        Initialise les données pour la simulation.
+        Regroupe l'état des corps dans des tableaux contigus (N,3) et (N,).
+        Les positions, vitesses et forces des corps deviennent des vues sur ces tableaux (voir Body) ;
+        un corps absorbé lors d'une collision partage la ligne du corps qui l'a absorbé.
+        Les particules test suivent les Nb_bodies corps massifs, avec une masse gravitationnelle nulle :
+        seuls les corps massifs sont des sources de gravité. Leur force est celle exercée sur une masse
+        unité (masse inerte de 1 kg).
+        """
+        self.Nb_bodies = len(self.Bodies)  # Corps massifs, en tête des tableaux d'état
+        def gather(attribute, field):
+            return np.concatenate([np.array([getattr(element, attribute) for element in self.Bodies], dtype=float)]
+                                  + [getattr(population, field) for population in self.Particles])
+        self.Positions = gather('Position', 'Positions')  # [km]
+        self.Velocities = gather('Velocity', 'Velocities')  # [km/s]
+        self.Forces = np.zeros_like(self.Positions)  # [N]
+        self.Masses = np.zeros(len(self.Positions))  # [kg]
+        self.Masses[:self.Nb_bodies] = [element.Mass for element in self.Bodies]
+        self.Inertial_Masses = np.where(self.Masses > 0, self.Masses, 1.0)  # [kg]
+        self.Radii = gather('Radius', 'Radius')  # [km]
+        self.Albedos = gather('Albedo', 'Albedo')
+        self.Emissivities = gather('Emissivity', 'Emissivity')
+        self.Body_Temperatures = gather('Temperature', 'Temperatures')  # [K]
+        self.Thermic_Radiations = self.Body_Temperatures ** 4
+        for k, element in enumerate(self.Bodies):
+            element.Attach(self, k)
+        for element in self.Elements:
+            host = element
+            while host.Host is not None:
+                host = host.Host
+            if host is not element:
+                element.Attach(self, host.Index)
+        # Ligne de l'état enregistrée pour chaque corps, si des corps ont été absorbés
+        self.Record_Rows = None
+        if self.Nb_bodies < len(self.Elements):
+            self.Record_Rows = np.array([element.Index for element in self.Elements])
+        start = self.Nb_bodies
+        for population in self.Particles:
+            population.Attach(self, slice(start, start + len(population)))
+            start += len(population)
+        self.Classify_Emitters()
+        self.Pair_I = self.Pair_J = None  # Paires non ordonnées (i < j), créées au premier calcul direct
+        self.Geometry = None  # Géométrie des paires, recalculée après chaque déplacement
+        self.Forces_Current = False  # Les forces correspondent-elles aux positions actuelles ?
+
+    def Classify_Emitters(self):
+        """
+        Sépare les sources de radiation des simples récepteurs : un corps émet si son attribut Emitter vaut True,
+        ou, s'il vaut None, si le flux L / r² (L = R² T⁴) qu'il apporte à l'un des récepteurs (corps non
+        réfléchissants et particules test) atteint Radiation_Threshold fois le flux total reçu par ce récepteur.
+        Ce flux total est minoré par celui des corps de luminosité au moins Radiation_Threshold fois la plus grande,
+        toujours émetteurs : aucun émetteur significatif n'est écarté. Les paires (émetteur faible, récepteur)
+        proches sont trouvées par tri et balayage, à partir des positions au moment de l'assemblage de l'état.
+        Le flux reçu n'est ensuite sommé que sur les S émetteurs : O(N·S) au lieu de O(N²).
+        """
+        N, threshold = self.Nb_bodies, self.Radiation_Threshold
+        luminosities = self.Radii[:N] ** 2 * self.Body_Temperatures[:N] ** 4
+        bright = luminosities >= threshold * np.max(luminosities)
+        dim = np.flatnonzero(~bright & (luminosities > 0))
+        receivers = np.flatnonzero(self.Albedos != 1.0)
+        if len(dim) and len(receivers):
+            sources = np.flatnonzero(bright)
+            dvec = self.Positions[receivers, None, :] - self.Positions[None, sources, :]
+            dnorm2 = np.einsum('isk,isk->is', dvec, dvec)
+            received = np.sum(np.where(dnorm2 > 0, luminosities[sources] / np.where(dnorm2 > 0, dnorm2, 1), 0), axis=1)
+            reference = threshold * received  # Flux minimal d'un émetteur pour chaque récepteur
+            if np.min(reference) == 0:
+                bright[dim] = True  # Un récepteur n'est éclairé que par des corps faibles
+            else:
+                from Encounters import Sweep_cross
+                # Récepteurs groupés par ordre de grandeur du flux : la portée d'un corps faible est bornée
+                # dans chaque groupe par le flux minimal du groupe
+                groups = np.floor(np.log2(reference) / 2)
+                for group in np.unique(groups):
+                    members = np.flatnonzero(groups == group)
+                    reach = np.sqrt(luminosities[dim] / np.min(reference[members]))  # Portée des corps faibles [km]
+                    points = self.Positions[receivers[members]]
+                    I, J = Sweep_cross(self.Positions[dim] - reach[:, None], self.Positions[dim] + reach[:, None],
+                                       points, points)
+                    separation = self.Positions[dim[I]] - points[J]
+                    dnorm2 = np.einsum('ik,ik->i', separation, separation)
+                    J = members[J]
+                    keep = (dim[I] != receivers[J]) & (luminosities[dim[I]] >= reference[J] * dnorm2)
+                    bright[dim[I[keep]]] = True
+        flags = [bright[k] if element.Emitter is None else element.Emitter for k, element in enumerate(self.Bodies)]
+        self.Emitters = np.flatnonzero(flags)  # Indices des émetteurs (S,)
+
+    def Set_Backend(self, backend):
+        """
+        Choisit les noyaux de gravité et de radiation du moteur 'packed' avec le solveur direct :
+        'numpy' (vectorisés) ou 'numba' (compilés à la volée, parallèles, sans allocation par étape).
+        Si Numba n'est pas installé, les noyaux NumPy sont utilisés.
+        """
+        if backend not in ('numpy', 'numba'):
+            raise ValueError(f"Backend inconnu : {backend}")
+        if backend == 'numba' and not NUMBA_AVAILABLE:
+            print("Numba n'est pas installé : les noyaux NumPy sont utilisés")
+            backend = 'numpy'
+        self.Gravity_kernel = self.Radiation_kernel = self.Block_kernel = None  # Noyaux compilés de ce système
+        if backend == 'numba':
+            from Jit_kernels import Gravity_kernel, Radiation_kernel, Block_kernel
+            self.Gravity_kernel, self.Radiation_kernel, self.Block_kernel = Gravity_kernel, Radiation_kernel, Block_kernel
+        self.Backend = backend
+        self.Invalidate()
+
+    def Invalidate(self):
+        """
+        Signale que les positions ont changé : géométrie et forces sont à recalculer.
+        """
+        self.Geometry = None
+        self.Forces_Current = False
+
+    def Sync_Bodies(self):
+        """
+        Recopie dans les corps les grandeurs scalaires calculées sur les tableaux du système.
         """
-        self.Time = np.linspace(0.0, Time/YEAR, Nb_step)
         for element in self.Elements:
-            self.Trajectories[element.Name] = np.zeros((3, Nb_step))  # Trajectoires (x, y, z)
-            self.Temperatures[element.Name] = np.zeros(Nb_step)  # Températures en fonction du temps
+            element.Temperature = self.Body_Temperatures[element.Index]
+            element.Thermic_Radiation_Resultant = self.Thermic_Radiations[element.Index]
+
+    def Merge(self, Pairs, Particle_rows=()):
+        """
+        Fusionne chaque paire (survivant, absorbé) de lignes de corps massifs : le survivant prend la masse
+        totale, la position et la vitesse du centre de masse (quantité de mouvement conservée), le volume total
+        et la température moyenne pondérée par les masses. Les particules test des lignes Particle_rows sont
+        retirées. L'état est ensuite reconstruit sur les corps restants (voir Pack_State) : les corps absorbés
+        gardent leur place dans l'historique et y suivent le corps qui les a absorbés.
+        """
+        self.Sync_Bodies()
+        for a, b in Pairs:
+            survivor, absorbed = self.Bodies[a], self.Bodies[b]
+            m_a, m_b = self.Masses[a], self.Masses[b]
+            mass = m_a + m_b
+            survivor.Temperature = (m_a * self.Body_Temperatures[a] + m_b * self.Body_Temperatures[b]) / mass
+            survivor.Radius = (self.Radii[a] ** 3 + self.Radii[b] ** 3) ** (1 / 3)
+            survivor.Position = (m_a * self.Positions[a] + m_b * self.Positions[b]) / mass
+            survivor.Velocity = (m_a * self.Velocities[a] + m_b * self.Velocities[b]) / mass
+            survivor.Mass = mass
+            absorbed.Host = survivor
+        self.Bodies = [element for element in self.Bodies if element.Host is None]
+        removed = np.zeros(len(self.Positions), dtype=bool)
+        removed[list(Particle_rows)] = True
+        for population in self.Particles:
+            population.Detach(~removed[population.Rows])
+        self.Pack_State()
+        self.Block_Levels = None
+
+    def Init_Data(self, Time, Nb_step, every=1, chunk=None):
+        """
+        Initialise les données pour la simulation.
+        Seul un pas sur every est enregistré, dans un tampon de chunk enregistrements
+        (tout l'historique si chunk vaut None).
+        """
+        self.Duration, self.Nb_step, self.Every = Time / YEAR, Nb_step, every
+        nb_records = -(-Nb_step // every)
+        size = nb_records if chunk is None else min(chunk, nb_records)
+        self.Record_Start = 0  # Indice du premier enregistrement contenu dans le tampon
+        self.Time = self.Record_Times(0, size)
+        self.Trajectory_Data = np.zeros((len(self.Elements), 3, size))  # Trajectoires (corps, x/y/z, temps)
+        self.Temperature_Data = np.zeros((len(self.Elements), size))  # Températures (corps, temps)
+        self.Link_Data()
+
+    def Link_Data(self):
+        """
+        Relie les dictionnaires de trajectoires et de températures au tampon d'enregistrement.
+        """
+        for k, element in enumerate(self.Elements):
+            self.Trajectories[element.Name] = self.Trajectory_Data[k]  # Vue sur les trajectoires (x, y, z)
+            self.Temperatures[element.Name] = self.Temperature_Data[k]  # Vue sur les températures
+
+    def Load_Data(self, Path):
+        """
+        Relie les trajectoires et les températures à un fichier écrit par Trajectory_Store, sans le charger
+        en mémoire : Animation et Display_Trajectory fonctionnent alors sans relancer la simulation.
+        """
+        header, self.Time, data = Open_store(Path)
+        if [body['Name'] for body in header['Bodies']] != [element.Name for element in self.Elements]:
+            raise ValueError(f"{Path} ne contient pas les trajectoires des corps de ce système")
+        self.Trajectory_Data = data[:, :3]  # Vues (corps, x/y/z, temps) sur le fichier
+        self.Temperature_Data = data[:, 3]
+        self.Link_Data()
+
+    @classmethod
+    def From_Store(cls, Path):
+        """
+        Recrée un système à partir de l'en-tête d'un fichier de trajectoires (état initial des corps)
+        et le relie aux données du fichier.
+        """
+        header, _ = Read_header(Path)
+        elements = [Body(body['Name'], body['Position'], body['Velocity'],
+                         body['Mass'], body['Radius'], body['Temperature'], body['Albedo'], body['Emissivity'],
+                         body['Color']) for body in header['Bodies']]
+        system = cls(elements, header['Engine'])
+        system.Load_Data(Path)
+        return system
+
+    def Record_Times(self, first, count):
+        """
+        Instants [années] des enregistrements first à first + count, sur l'axe np.linspace(0, Time, Nb_step).
+        """
+        step = self.Duration / (self.Nb_step - 1) if self.Nb_step > 1 else 0.0
+        return (first + np.arange(count)) * self.Every * step
 
     def Save_Data(self, k):
         """
         Enregistre les données de position et de température à chaque étape.
         """
-        for element in self.Elements:
-            self.Trajectories[element.Name][:, k] = np.ravel(element.Position)  # Enregistre la position
-            self.Temperatures[element.Name][k] = element.Temperature  # Enregistre la température
+        if k % self.Every:
+            return
+        slot = k // self.Every - self.Record_Start
+        rows = slice(self.Nb_bodies) if self.Record_Rows is None else self.Record_Rows
+        self.Trajectory_Data[:, :, slot] = self.Positions[rows]  # Enregistre les positions
+        self.Temperature_Data[:, slot] = self.Body_Temperatures[rows]  # Enregistre les températures
+
+    def Pair_Geometry(self):
+        """
+        Calcule une seule fois par étape la géométrie de chaque paire non ordonnée (i < j) :
+        vecteur séparation, distance et inverse du cube de la distance.
+        Avec le solveur de Barnes-Hut, le champ de gravité est évalué sur l'octree.
+        """
+        if self.Solver == 'barnes-hut':
+            N = self.Nb_bodies
+            tree = Octree(self.Positions[:N], self.Masses[:N])  # Seuls les corps massifs sont dans l'arbre
+            field = tree.Evaluate(self.Positions[:N], self.Theta, np.arange(N))
+            if self.Particles:
+                field = np.concatenate([field, tree.Evaluate(self.Positions[N:], self.Theta)])
+            self.Geometry = field
+            return
+
+        if self.Engine == 'loop':
+            self.Geometry = []
+            positions = [element.Position for element in self.Bodies]  # Vues créées une fois par passe
+            for a, i in enumerate(self.Bodies):
+                for b in range(a + 1, len(self.Bodies)):
+                    dvec = (positions[a] - positions[b]) * 1e3  # Distance en mètres
+                    dnorm = np.linalg.norm(dvec)  # Norme de la distance
+                    self.Geometry.append((a, b, dvec, dnorm, 1 / dnorm ** 3))
+            return
+
+        if self.Pair_I is None:
+            self.Pair_I, self.Pair_J = np.triu_indices(self.Nb_bodies, 1)
+        dvec = (self.Positions[self.Pair_I] - self.Positions[self.Pair_J]) * 1e3  # Distances en mètres (P,3)
+        dnorm = np.sqrt(np.einsum('pk,pk->p', dvec, dvec))  # Normes des distances (P,)
+        self.Geometry = (dvec, dnorm, 1 / dnorm ** 3)
+
+    def Jit_Active(self):
+        """
+        Les noyaux compilés sont-ils utilisés pour l'étape en cours ?
+        """
+        return self.Backend == 'numba' and self.Engine == 'packed' and self.Solver == 'direct'
 
     def Gravitation_law(self):
         """
         Calcule la force gravitationnelle agissant sur chaque corps.
+        Chaque paire est évaluée une fois et applique des forces opposées (troisième loi de Newton).
+        Les forces ne sont recalculées que si les positions ont changé depuis le dernier appel.
         """
-        for i in self.Elements:
-            force_sum = 0
-            for j in self.Elements:
-                if j != i:
-                    dvec = (i.Position - j.Position) * 1e3  # Distance en mètres
-                    dnorm = np.linalg.norm(dvec)  # Norme de la distance
-                    force_sum += i.Mass * j.Mass * dvec / (dnorm ** 3)  # Loi de gravitation
-            i.Force_Resultant = -G * force_sum  # Force résultante sur le corps i
+        if self.Forces_Current:
+            return
+        self.Forces_Current = True
+        self.Force_Evaluations += 1
+        if self.Jit_Active():
+            self.Gravity_kernel(self.Positions, self.Masses, self.Inertial_Masses, self.Nb_bodies, self.Forces, G)
+            return
+        if self.Geometry is None:
+            self.Pair_Geometry()
+
+        if self.Solver == 'barnes-hut':
+            field = self.Geometry  # Champ Σ m_j (x_j - x_i) / r³ en kg/km²
+            self.Forces[:] = G * 1e-6 * self.Inertial_Masses[:, None] * field
+            return
+
+        if self.Engine == 'loop':
+            forces = [element.Force_Resultant for element in self.Bodies]  # Vues créées une fois par passe
+            for force in forces:
+                force[:] = 0
+            for a, b, dvec, dnorm, inv3 in self.Geometry:
+                i, j = self.Bodies[a], self.Bodies[b]
+                force = -G * i.Mass * j.Mass * dvec * inv3  # Loi de gravitation
+                forces[a] += force
+                forces[b] -= force
+            return
+
+        dvec, dnorm, inv3 = self.Geometry
+        force = (G * self.Masses[self.Pair_I] * self.Masses[self.Pair_J] * inv3)[:, None] * dvec
+        N = self.Nb_bodies
+        for axis in range(3):
+            self.Forces[:N, axis] = (np.bincount(self.Pair_J, force[:, axis], N)
+                                     - np.bincount(self.Pair_I, force[:, axis], N))
+        if self.Particles:
+            # Particules test : champ des seuls corps massifs, O(N_corps × N_particules)
+            self.Forces[N:] = G * 1e-6 * Direct_field(self.Positions[:N], self.Masses[:N], self.Positions[N:])
 
     def Thermic_Radiation_law(self):
         """
-        Calcule la radiation thermique agissant sur chaque corps.
-        """
-        for i in self.Elements:
-            if i.Albedo != 1.0:  # Si le corps n'est pas parfaitement réfléchissant
-                rad_sum = 0
-                for j in self.Elements:
-                    if j != i:
-                        dvec = (i.Position - j.Position) * 1e3  # Distance en mètres
-                        dnorm = np.linalg.norm(dvec)  # Norme de la distance
-                        rad_sum += (j.Radius * 1e3 / dnorm) ** 2 * j.Temperature ** 4
-                i.Thermic_Radiation_Resultant = (1 - i.Albedo) / (4 * i.Emissivity) * rad_sum
-            else:
-                i.Thermic_Radiation_Resultant = i.Temperature ** 4
+        Calcule la radiation thermique reçue par chaque corps de la part des émetteurs (voir Classify_Emitters),
+        en une passe vectorisée sur la matrice (corps, émetteurs).
+        """
+        if self.Jit_Active():
+            self.Radiation_kernel(self.Positions, self.Radii, self.Body_Temperatures, self.Albedos, self.Emissivities,
+                             self.Emitters, self.Thermic_Radiations)
+            return
+
+        if self.Engine == 'loop':
+            if self.Geometry is None:
+                self.Pair_Geometry()
+            emitter = np.zeros(len(self.Bodies), dtype=bool)
+            emitter[self.Emitters] = True
+            rad_sums = [0] * len(self.Bodies)
+            for a, b, dvec, dnorm, inv3 in self.Geometry:
+                i, j = self.Bodies[a], self.Bodies[b]
+                if emitter[b]:
+                    rad_sums[a] += (j.Radius * 1e3 / dnorm) ** 2 * j.Temperature ** 4
+                if emitter[a]:
+                    rad_sums[b] += (i.Radius * 1e3 / dnorm) ** 2 * i.Temperature ** 4
+            for k, i in enumerate(self.Bodies):
+                if i.Albedo != 1.0:  # Si le corps n'est pas parfaitement réfléchissant
+                    i.Thermic_Radiation_Resultant = (1 - i.Albedo) / (4 * i.Emissivity) * rad_sums[k]
+                else:
+                    i.Thermic_Radiation_Resultant = i.Temperature ** 4
+                self.Thermic_Radiations[k] = i.Thermic_Radiation_Resultant
+            return
+
+        emitters = self.Emitters
+        emission = (self.Radii[emitters] * 1e3) ** 2 * self.Body_Temperatures[emitters] ** 4  # (S,)
+        dvec = (self.Positions[:, None, :] - self.Positions[None, emitters, :]) * 1e3  # Distances en mètres (N,S,3)
+        dnorm2 = np.einsum('isk,isk->is', dvec, dvec)
+        own = np.arange(len(self.Positions))[:, None] == emitters[None, :]  # Un émetteur ne s'éclaire pas lui-même
+        rad_sum = np.sum(np.where(own, 0, emission / np.where(own, 1, dnorm2)), axis=1)
+        reflective = self.Albedos == 1.0  # Corps parfaitement réfléchissants (étoiles)
+        self.Thermic_Radiations[:] = np.where(reflective, self.Body_Temperatures ** 4,
+                                              (1 - self.Albedos) / (4 * self.Emissivities) * rad_sum)
 
     def Transition(self, Time_step):
         """
         Met à jour la position, la vitesse et la température des corps en fonction des lois physiques.
+        L'intégrateur 'euler' reprend le schéma d'origine (Euler semi-implicite d'ordre 1).
         """
-        for element in self.Elements:
-            # Mise à jour de la vitesse en fonction de la force gravitationnelle
-            element.Velocity += Time_step * element.Force_Resultant / element.Mass / 1e3  # Vitesse en km/s
-            # Mise à jour de la position en fonction de la vitesse
-            element.Position += Time_step * element.Velocity
-            # Mise à jour de la température en fonction de la radiation thermique
-            element.Temperature = element.Thermic_Radiation_Resultant ** (1 / 4)
+        if self.Engine == 'loop' and self.Integrator == 'euler':
+            for k, element in enumerate(self.Bodies):
+                # Mise à jour de la vitesse en fonction de la force gravitationnelle
+                element.Velocity += Time_step * element.Force_Resultant / element.Mass / 1e3  # Vitesse en km/s
+                # Mise à jour de la position en fonction de la vitesse
+                element.Position += Time_step * element.Velocity
+                # Mise à jour de la température en fonction de la radiation thermique
+                element.Temperature = self.Thermic_Radiations[k] ** (1 / 4)
+                self.Body_Temperatures[k] = element.Temperature
+            self.Invalidate()
+            return
+
+        if self.Integrator == 'euler':
+            self.Velocities += Time_step * self.Forces / self.Inertial_Masses[:, None] / 1e3  # Vitesses en km/s
+            self.Positions += Time_step * self.Velocities
+            self.Invalidate()
+        elif self.Integrator == 'leapfrog':
+            self.Leapfrog(Time_step)
+        elif self.Integrator == 'yoshida4':
+            self.Yoshida(Time_step)
+        elif self.Integrator == 'rk45':
+            self.Adaptive(Time_step)
+        elif self.Integrator == 'block':
+            self.Block(Time_step)
+        elif self.Integrator == 'wisdom-holman':
+            self.Wisdom_Holman(Time_step)
+        else:
+            raise ValueError(f"Intégrateur inconnu : {self.Integrator}")
+        self.Body_Temperatures[:] = self.Thermic_Radiations ** (1 / 4)
+
+    def Accelerations(self):
+        """
+        Renvoie les accélérations gravitationnelles des corps aux positions actuelles [km/s2].
+        """
+        self.Gravitation_law()
+        return self.Forces / self.Inertial_Masses[:, None] / 1e3
+
+    def Leapfrog(self, Time_step):
+        """
+        Pas de leapfrog (kick-drift-kick, Verlet vitesse) : symplectique d'ordre 2, une évaluation des forces.
+        """
+        self.Velocities += 0.5 * Time_step * self.Accelerations()
+        self.Positions += Time_step * self.Velocities
+        self.Invalidate()
+        self.Velocities += 0.5 * Time_step * self.Accelerations()
+
+    def Yoshida(self, Time_step):
+        """
+        Pas de Yoshida d'ordre 4 : composition de trois leapfrogs, trois évaluations des forces.
+        """
+        for kick, drift in zip(YOSHIDA_KICKS, YOSHIDA_DRIFTS + [None]):
+            self.Velocities += kick * Time_step * self.Accelerations()
+            if drift is not None:
+                self.Positions += drift * Time_step * self.Velocities
+                self.Invalidate()
+
+    def Adaptive(self, Time_step):
+        """
+        Avance le système de Time_step par des sous-pas de Dormand-Prince 5(4) à pas adaptatif,
+        avec contrôle de l'erreur locale relative à la tolérance self.Tolerance.
+        """
+        h = self.Adaptive_Step or Time_step
+        elapsed = 0.0
+        while elapsed < Time_step:
+            step = min(h, Time_step - elapsed)
+            x0, v0 = self.Positions.copy(), self.Velocities.copy()
+            kx, kv = [v0], [self.Accelerations()]
+            for stage in range(1, 7):
+                self.Positions[:] = x0 + step * sum(a * k for a, k in zip(DOPRI_A[stage], kx))
+                self.Velocities[:] = v0 + step * sum(a * k for a, k in zip(DOPRI_A[stage], kv))
+                self.Invalidate()
+                kx.append(self.Velocities.copy())
+                kv.append(self.Accelerations())
+
+            # Erreur locale rapportée à l'échelle de chaque composante
+            ex = step * sum(e * k for e, k in zip(DOPRI_E, kx))
+            ev = step * sum(e * k for e, k in zip(DOPRI_E, kv))
+            sx = self.Tolerance * (np.maximum(np.abs(x0), np.abs(self.Positions)) + 1e-3 * np.max(np.abs(x0)))
+            sv = self.Tolerance * (np.maximum(np.abs(v0), np.abs(self.Velocities)) + 1e-3 * np.max(np.abs(v0)))
+            error = max(np.max(np.abs(ex) / sx), np.max(np.abs(ev) / sv))
+
+            factor = min(5.0, max(0.2, 0.9 * max(error, 1e-10) ** (-1 / 5)))
+            if error <= 1.0:
+                elapsed += step
+            else:
+                self.Positions[:], self.Velocities[:] = x0, v0
+                self.Invalidate()
+            if error > 1.0 or step == h:  # Un dernier sous-pas raccourci ne réduit pas le pas proposé
+                h = step * factor
+        self.Adaptive_Step = h
+
+    def Interaction_Accelerations(self, others, Q, mu):
+        """
+        Accélérations d'interaction [km/s2] des corps d'indices others (tous sauf le corps central) :
+        accélération totale moins l'attraction du corps central, pour leurs positions héliocentriques Q actuelles.
+        """
+        central = -mu * Q / np.einsum('ik,ik->i', Q, Q)[:, None] ** 1.5
+        return self.Accelerations()[others] - central
+
+    def Wisdom_Holman(self, Time_step):
+        """
+        Pas de Wisdom-Holman en coordonnées héliocentriques démocratiques (positions relatives au corps
+        le plus massif, vitesses barycentriques) : le mouvement képlérien autour du corps central est
+        propagé analytiquement (voir Kepler.py), les interactions entre les autres corps sont appliquées
+        en kicks et le mouvement du corps central en dérives linéaires. Schéma symplectique d'ordre 2
+        (kick, dérive, Kepler, dérive, kick), une évaluation des forces par pas ; le pas peut être une
+        fraction de la plus courte période orbitale. Précis tant qu'un corps domine la masse du système.
+        """
+        c = int(np.argmax(self.Masses[:self.Nb_bodies]))  # Corps central
+        others, central_mass = np.flatnonzero(np.arange(len(self.Positions)) != c), self.Masses[c]
+        mu = G * 1e-9 * central_mass  # [km3/s2]
+        masses, total = self.Masses[others], np.sum(self.Masses)
+        barycentre = self.Masses @ self.Positions / total
+        drift = self.Masses @ self.Velocities / total  # Vitesse du barycentre [km/s]
+
+        Q = self.Positions[others] - self.Positions[c]  # Positions héliocentriques [km]
+        P = self.Velocities[others] - drift  # Vitesses barycentriques [km/s]
+        P += 0.5 * Time_step * self.Interaction_Accelerations(others, Q, mu)
+        Q += 0.5 * Time_step * (masses @ P) / central_mass
+        Q, P = Kepler_drift(Q, P, mu, Time_step)
+        Q += 0.5 * Time_step * (masses @ P) / central_mass
+
+        # Retour aux coordonnées du système : le barycentre avance en ligne droite
+        self.Positions[c] = barycentre + Time_step * drift - masses @ Q / total
+        self.Positions[others] = Q + self.Positions[c]
+        self.Invalidate()
+        P += 0.5 * Time_step * self.Interaction_Accelerations(others, Q, mu)
+        self.Velocities[others] = P + drift
+        self.Velocities[c] = drift - masses @ P / central_mass
 
     def Display_Trajectory(self, step):
         """
-        Affiche les trajectoires des corps dans un graphe 3D.
+        Affiche les trajectoires des corps dans un graphe 3D, et leur position à l'enregistrement step.
+        Après une simulation avec sink, seul le dernier bloc est en mémoire (voir Display_Temperature).
         """
+        import matplotlib.pyplot as plt
         fig = plt.figure('Trajectories')
         ax = fig.add_subplot(projection="3d")
         plt.title('Trajectories')
@@ -115,30 +683,328 @@ class System:
                       marker='o', color=element.Color, label=element.Name)
         ax.legend()
 
-    def Display_Temperature(self, Time, Nb_step):
+    def Display_Temperature(self, Time=None, Nb_step=None):
         """
-        Affiche les températures des corps en fonction du temps.
+        Affiche les températures des corps aux instants enregistrés (self.Time, un pas sur every) ;
+        Time et Nb_step ne servent plus et restent acceptés pour compatibilité. Après une simulation
+        avec sink, l'historique en mémoire ne contient que le dernier bloc : Load_Data relit le fichier complet.
         """
+        import matplotlib.pyplot as plt
         for element in self.Elements:
             plt.figure(f'Temperature of {element.Name}')
             plt.title(f'Temperature of {element.Name}')
             plt.xlabel('Time [s]')
             plt.ylabel('Temperature [°C]')
-            plt.plot(np.linspace(0, Time, Nb_step),
-                     self.Temperatures[element.Name] - 273, linestyle='solid', color=element.Color)
+            plt.plot(self.Time * YEAR, self.Temperatures[element.Name] - 273, linestyle='solid', color=element.Color)
 
-    def Simulation(self, Time, Nb_step):
+    def Block_Forces(self, index, scales=False):
         """
-        Lance la simulation du système pour une durée donnée.
+        Calcule l'accélération [km/s2] des seuls corps d'indices index sous l'effet des corps massifs, par
+        sommation directe (NumPy ou noyau compilé selon le backend). Avec scales, renvoie aussi les sommes
+        des normes des accélérations et des jerks [km/s3] de chaque paire (voir Block_Level).
+        """
+        N = self.Nb_bodies
+        self.Force_Evaluations += len(index) / len(self.Positions)
+        if self.Jit_Active():
+            acceleration, sums = np.empty((len(index), 3)), np.zeros((len(index), 2))
+            self.Block_kernel(self.Positions, self.Velocities, self.Masses, N, index, scales, acceleration, sums,
+                              G * 1e-9)
+        else:
+            dvec = self.Positions[None, :N, :] - self.Positions[index][:, None, :]  # x_j - x_i [km]
+            dnorm2 = np.einsum('ijk,ijk->ij', dvec, dvec)
+            rows = np.flatnonzero(index < N)  # Corps massifs parmi les corps actifs
+            dnorm2[rows, index[rows]] = 1.0
+            weights = G * 1e-9 * self.Masses[None, :N] / dnorm2 ** 1.5
+            weights[rows, index[rows]] = 0  # Pas d'interaction d'un corps avec lui-même
+            acceleration = np.einsum('ij,ijk->ik', weights, dvec)
+            if scales:
+                dvel = self.Velocities[None, :N, :] - self.Velocities[index][:, None, :]
+                rv = np.einsum('ijk,ijk->ij', dvec, dvel) / dnorm2
+                pair_jerk = weights[:, :, None] * (dvel - 3 * rv[:, :, None] * dvec)
+                sums = np.stack([np.sum(weights * np.sqrt(dnorm2), axis=1),
+                                 np.sum(np.linalg.norm(pair_jerk, axis=2), axis=1)], axis=1)
+        self.Forces[index] = self.Inertial_Masses[index, None] * acceleration * 1e3
+        return acceleration, (sums[:, 0], sums[:, 1]) if scales else None
+
+    def Block_Level(self, Scales, Time_step):
+        """
+        Niveau de pas par blocs de chaque corps d'après le critère dt = Eta * Σ|a_ij| / Σ|da_ij/dt|.
+        Les normes sont sommées paire par paire pour ne pas être trompé par des forces qui se compensent.
+        """
+        a, j = Scales
+        dt = np.where(j > 0, self.Eta * a / np.where(j > 0, j, 1), Time_step)
+        level = np.ceil(np.log2(Time_step / np.maximum(dt, 1e-300)))
+        return np.clip(level, 0, self.Max_Level).astype(int)
+
+    def Block(self, Time_step):
+        """
+        Avance le système de Time_step par des pas individuels hiérarchiques (blocs de puissances de deux) :
+        chaque corps fait des pas leapfrog de Time_step / 2**niveau et seuls les corps en fin de pas
+        recalculent leurs forces, les positions des corps massifs étant prédites au second ordre à partir
+        de leur état en début de pas. Les niveaux sont fixés pour tout l'intervalle et les corps rangés par
+        niveau : à chaque instant, les corps actifs sont la tranche des niveaux au moins égaux à celui de
+        l'instant, et le début du pas de chaque corps se déduit de l'instant. À la fin de l'intervalle, tous
+        les corps sont synchronisés et leurs niveaux recalculés.
+        """
+        N, Nb = len(self.Positions), self.Nb_bodies
+        if self.Block_Levels is None:
+            self.Block_Acceleration, scales = self.Block_Forces(np.arange(N), scales=True)
+            self.Block_Levels = self.Block_Level(scales, Time_step)
+
+        order = np.argsort(self.Block_Levels, kind='stable')  # Corps rangés par niveau croissant
+        top = int(self.Block_Levels[order[-1]])  # Niveau le plus fin
+        first = np.searchsorted(self.Block_Levels[order], np.arange(top + 1))  # Premier corps de chaque niveau
+        unit = Time_step / 2 ** top  # Unité de temps : le pas du niveau le plus fin
+        span = 2 ** (top - self.Block_Levels)  # Durée du pas de chaque corps en unités
+        steps = (span * unit)[:, None]  # Durée du pas de chaque corps [s]
+        start = np.zeros(Nb, dtype=np.int64)  # Début du pas en cours des corps massifs
+        x0, v0 = self.Positions.copy(), self.Velocities.copy()  # État au début du pas de chaque corps
+        a0 = self.Block_Acceleration
+        for tick in range(1, 2 ** top + 1):
+            level = top - ((tick & -tick).bit_length() - 1)  # Seuls les niveaux >= level finissent leur pas
+            active = order[first[level]:]
+            last = level == 0  # Fin de l'intervalle : tous les corps sont actifs
+
+            # Prédiction des corps massifs (sources) et des particules actives à l'instant tick
+            tau = ((tick - start) * unit)[:, None]
+            self.Positions[:Nb] = x0[:Nb] + tau * (v0[:Nb] + tau * a0[:Nb] / 2)
+            if Nb < N:
+                moving = active[active >= Nb]
+                self.Positions[moving] = x0[moving] + steps[moving] * (v0[moving] + steps[moving] * a0[moving] / 2)
+            step = steps[active]
+            if last:
+                self.Velocities[active] = v0[active] + step * a0[active]  # Vitesses prédites pour le critère de pas
+            self.Invalidate()
+
+            # Corps en fin de pas : nouvelles forces et kick final
+            acceleration, scales = self.Block_Forces(active, scales=last)
+            self.Velocities[active] = v0[active] + step * (a0[active] + acceleration) / 2
+            x0[active], v0[active] = self.Positions[active], self.Velocities[active]
+            a0[active] = acceleration
+            start[active[active < Nb]] = tick
+        self.Block_Levels[order] = self.Block_Level(scales, Time_step)
+        self.Forces_Current = True  # Tous les corps viennent de recalculer leurs forces
+
+    def Setup(self, solver='direct', theta=0.5, integrator='euler', tolerance=1e-9, eta=0.02, max_level=12):
+        """
+        Choisit le solveur de gravité et l'intégrateur utilisés par la simulation (voir Simulation).
+        """
+        self.Solver, self.Theta = solver, theta
+        self.Integrator, self.Tolerance, self.Adaptive_Step = integrator, tolerance, None
+        self.Eta, self.Max_Level, self.Block_Levels = eta, max_level, None
+        if integrator == 'block' and solver != 'direct':
+            raise ValueError("L'intégrateur 'block' nécessite le solveur direct (critère de pas calculé paire par paire)")
+        self.Invalidate()
+        if solver == 'barnes-hut':
+            self.Tree_Error = Force_Error(self.Positions[:self.Nb_bodies], self.Masses[:self.Nb_bodies], theta)
+            print(f"Barnes-Hut (theta={theta}) : erreur relative sur la force {self.Tree_Error['median']:.1e} "
+                  f"(médiane), {self.Tree_Error['max']:.1e} (max) par rapport à la sommation directe")
+
+    def Stream(self, Time, Nb_step, every=1, chunk=1024, restore=None, profile=None, monitor=None, progress=True,
+               encounters=None, **options):
+        """
+        Générateur lançant la simulation et renvoyant l'historique par blocs d'au plus chunk enregistrements
+        (un pas sur every) : (temps [années], trajectoires (corps, x/y/z, temps), températures (corps, temps)).
+        Les tableaux renvoyés sont réutilisés pour le bloc suivant : il faut les copier pour les conserver.
+        restore est un checkpoint à partir duquel reprendre la simulation ; options est transmis à Setup.
+        profile active le profilage des phases (voir Profiling.py) : True, une liste de hooks ou un Profiler.
+        monitor suit les grandeurs conservées tous les monitor.Every pas (voir Conservation.Monitor).
+        progress affiche une barre de progression (tqdm).
+        encounters détecte les rencontres proches et les collisions à chaque pas (voir Encounters.py).
         """
         Time_step = Time / Nb_step
-        self.Init_Data(Time, Nb_step)
+        self.Init_Data(Time, Nb_step, every, chunk)
+        self.Setup(**options)
+        size, last = len(self.Time), (Nb_step - 1) // every  # Taille du tampon, dernier enregistrement
+        first = 0
+        if restore is not None:
+            run = self.Restore(restore)
+            first, self.Record_Start = run['Step'], run['Records']
+            self.Time = self.Record_Times(self.Record_Start, size)
+        if profile:
+            self.Profiler = profile if isinstance(profile, Profiler) else Profiler(() if profile is True else profile)
+            self.Profiler.Attach(self)
+        if monitor is not None:
+            monitor.Start(self)
+        try:
+            steps = range(first, Nb_step)
+            if progress:
+                from tqdm import tqdm
+                steps = tqdm(steps, initial=first, total=Nb_step)
+            for k in steps:
+                self.Step = k  # Dernier pas effectué
+                if encounters is not None:
+                    encounters.Start_Step(self)
+                self.Gravitation_law()
+                self.Thermic_Radiation_law()
+                if monitor is not None and k % monitor.Every == 0:
+                    monitor.Check(self, k)  # Géométrie des paires encore valide après le calcul des forces
+                self.Transition(Time_step)
+                if encounters is not None:
+                    encounters.Check(self, k, Time_step)
+                self.Save_Data(k)
+
+                if k % every == 0 and (k // every - self.Record_Start + 1 == size or k // every == last):
+                    filled = k // every - self.Record_Start + 1
+                    if k // every == last:
+                        # Dernier bloc : le tampon est réduit aux enregistrements valides
+                        self.Time = self.Time[:filled]
+                        self.Trajectory_Data = self.Trajectory_Data[:, :, :filled]
+                        self.Temperature_Data = self.Temperature_Data[:, :filled]
+                        self.Link_Data()
+                    yield self.Time[:filled], self.Trajectory_Data[:, :, :filled], self.Temperature_Data[:, :filled]
+                    if k // every < last:
+                        self.Record_Start += filled
+                        self.Time = self.Record_Times(self.Record_Start, size)
+        finally:
+            self.Sync_Bodies()
+            if profile:
+                self.Profiler.Detach()
+                self.Profiler.Report()
+            if monitor is not None:
+                monitor.Report()
+            if encounters is not None:
+                encounters.Report()
+
+    def Simulation(self, Time, Nb_step, solver='direct', theta=0.5, integrator='euler', tolerance=1e-9,
+                   eta=0.02, max_level=12, every=1, sink=None, chunk=1024, checkpoint=None, checkpoint_interval=60.0,
+                   profile=None, monitor=None, progress=True, encounters=None):
+        """
+        Lance la simulation du système pour une durée donnée.
+        solver choisit le calcul de la gravité : sommation directe ('direct') ou octree ('barnes-hut')
+        avec l'angle d'ouverture theta.
+        integrator choisit le schéma d'intégration : 'euler' (schéma d'origine), 'leapfrog' (ordre 2),
+        'yoshida4' (ordre 4), 'rk45' (Dormand-Prince à pas adaptatif, tolérance relative tolerance),
+        'block' (pas individuels Time / Nb_step / 2**niveau, niveau <= max_level, précision eta ; solveur direct)
+        ou 'wisdom-holman' (orbites képlériennes autour du corps le plus massif propagées analytiquement).
+        Seul un pas sur every est enregistré. Sans sink, tout l'historique est gardé en mémoire ;
+        avec un sink (voir Sinks.py, ou Trajectory_Store pour l'écrire sur disque), il lui est transmis
+        par blocs de chunk enregistrements et la mémoire utilisée ne dépend plus de la durée de la simulation :
+        l'historique en mémoire (Time, Trajectories, Temperatures) ne contient alors que le dernier bloc.
+        Avec un sink sur disque, checkpoint donne le fichier où l'état est sauvegardé au plus toutes les
+        checkpoint_interval secondes ; Resume(checkpoint) reprend la simulation après une interruption.
+        Avec profile (True, une liste de hooks(phase, secondes, pas) ou un Profiler), le temps passé dans
+        chaque phase du pas est mesuré et affiché à la fin ; le profileur reste accessible dans self.Profiler.
+        monitor (Conservation.Monitor) suit l'énergie, la quantité de mouvement et le moment cinétique et
+        avertit ou interrompt la simulation quand l'énergie dérive au-delà de son seuil.
+        progress=False supprime la barre de progression (et l'import de tqdm), pour les exécutions en lot.
+        encounters (Encounters.Encounters) détecte rencontres proches et collisions et y répond
+        (fusion, rebond ou pas raffiné) ; ses événements restent dans encounters.Events.
+        """
+        options = dict(solver=solver, theta=theta, integrator=integrator, tolerance=tolerance,
+                       eta=eta, max_level=max_level)
+        if sink is None:
+            if checkpoint is not None:
+                raise ValueError("Les checkpoints nécessitent un sink sur disque (Trajectory_Store)")
+            for _ in self.Stream(Time, Nb_step, every, None, profile=profile, monitor=monitor, progress=progress,
+                                 encounters=encounters, **options):
+                pass
+            return
+
+        sink.Open(self, Time, Nb_step, every)
+        run = dict(Time=Time, Nb_step=Nb_step, every=every, chunk=chunk, options=options)
+        stream = self.Stream(Time, Nb_step, every, chunk, profile=profile, monitor=monitor, progress=progress,
+                             encounters=encounters, **options)
+        self.Run_Sink(stream, sink, run, checkpoint, checkpoint_interval)
+
+    def Run_Sink(self, stream, sink, run, checkpoint, interval):
+        """
+        Transmet au sink les blocs produits par stream et, si checkpoint est un chemin, y sauvegarde l'état
+        après un bloc lorsqu'au moins interval secondes se sont écoulées depuis la sauvegarde précédente.
+        Le coût d'un checkpoint (état des corps et vidage du dernier bloc sur disque) ne dépend pas
+        de la durée de la simulation ; le temps total passé à les écrire est affiché à la fin.
+        """
+        start = last = time.perf_counter()
+        cost, count = 0.0, 0
+        try:
+            for times, trajectories, temperatures in stream:
+                sink.Write(times, trajectories, temperatures)
+                if checkpoint is not None and time.perf_counter() - last >= interval:
+                    last = time.perf_counter()
+                    sink.Flush()
+                    self.Save_Checkpoint(checkpoint, dict(run, Step=self.Step + 1, Sink=sink.Path,
+                                                          Records=self.Record_Start + len(times)))
+                    cost += time.perf_counter() - last
+                    count += 1
+                    last = time.perf_counter()
+        finally:
+            sink.Close()
+        if checkpoint is not None:
+            elapsed = time.perf_counter() - start
+            print(f"Checkpoints : {count} écriture(s), {1e3 * cost / max(count, 1):.1f} ms en moyenne, "
+                  f"{100 * cost / elapsed:.2f} % du temps de simulation")
 
-        for k in tqdm(range(Nb_step)):
-            self.Gravitation_law()
-            self.Thermic_Radiation_law()
-            self.Transition(Time_step)
-            self.Save_Data(k)
+    def Save_Checkpoint(self, Path, run):
+        """
+        Sauvegarde l'état complet des corps et de l'intégrateur, ainsi que la description run de la simulation
+        (paramètres, pas suivant, enregistrements écrits), dans le fichier .npz Path. Le fichier est écrit
+        à côté puis renommé : une interruption pendant l'écriture laisse intact le checkpoint précédent.
+        """
+        arrays = dict(Positions=self.Positions, Velocities=self.Velocities, Forces=self.Forces,
+                      Body_Temperatures=self.Body_Temperatures, Thermic_Radiations=self.Thermic_Radiations,
+                      Masses=self.Masses, Radii=self.Radii)
+        if self.Block_Levels is not None:
+            arrays.update(Block_Levels=self.Block_Levels, Block_Acceleration=self.Block_Acceleration)
+        for k, population in enumerate(self.Particles):
+            arrays[f'Particle_Ids_{k}'] = population.Ids  # Particules restantes après les collisions
+        hosts = {element.Name: element.Host.Name for element in self.Elements if element.Host is not None}
+        meta = dict(run, Names=[element.Name for element in self.Elements], Forces_Current=self.Forces_Current,
+                    Force_Evaluations=self.Force_Evaluations, Adaptive_Step=self.Adaptive_Step, Hosts=hosts)
+        temporary = os.fspath(Path) + '.tmp'
+        with open(temporary, 'wb') as file:
+            np.savez(file, Meta=np.array(json.dumps(meta)), **arrays)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, Path)
+
+    def Restore(self, Path):
+        """
+        Recharge l'état sauvegardé par Save_Checkpoint et renvoie la description de la simulation.
+        """
+        with np.load(Path) as data:
+            run = json.loads(str(data['Meta']))
+            if run['Names'] != [element.Name for element in self.Elements]:
+                raise ValueError(f"Le checkpoint {Path} ne correspond pas aux corps de ce système")
+            if run.get('Hosts') or any(f'Particle_Ids_{k}' in data and len(data[f'Particle_Ids_{k}']) < len(population)
+                                       for k, population in enumerate(self.Particles)):
+                # Fusions survenues avant le checkpoint : même structure d'état avant de recopier les tableaux
+                names = {element.Name: element for element in self.Elements}
+                for name, host in run['Hosts'].items():
+                    names[name].Host = names[host]
+                self.Bodies = [element for element in self.Elements if element.Host is None]
+                for k, population in enumerate(self.Particles):
+                    population.Detach(np.isin(population.Ids, data[f'Particle_Ids_{k}']))
+                self.Pack_State()
+            for name in ['Positions', 'Velocities', 'Forces', 'Body_Temperatures', 'Thermic_Radiations', 'Masses', 'Radii']:
+                if name in data:
+                    getattr(self, name)[:] = data[name]
+            self.Inertial_Masses = np.where(self.Masses > 0, self.Masses, 1.0)
+            for k, element in enumerate(self.Bodies):
+                element.Mass, element.Radius = self.Masses[k], self.Radii[k]
+            if 'Block_Levels' in data:
+                self.Block_Levels, self.Block_Acceleration = data['Block_Levels'], data['Block_Acceleration']
+        self.Invalidate()
+        self.Forces_Current = run['Forces_Current']
+        self.Force_Evaluations, self.Adaptive_Step = run['Force_Evaluations'], run['Adaptive_Step']
+        self.Sync_Bodies()
+        return run
+
+    def Resume(self, Path, sink=None, checkpoint_interval=60.0, profile=None, monitor=None, progress=True,
+               encounters=None):
+        """
+        Reprend bit pour bit une simulation interrompue à partir du checkpoint Path. Le système doit être
+        construit comme pour la simulation d'origine. Par défaut, la suite de l'historique est écrite dans
+        le fichier de trajectoires d'origine, à partir du dernier enregistrement sauvegardé.
+        profile, monitor, progress et encounters ne sont pas sauvegardés : ils sont à redonner comme pour
+        Simulation (le monitor prend alors pour référence l'état du checkpoint).
+        """
+        with np.load(Path) as data:
+            run = json.loads(str(data['Meta']))
+        sink = sink or Trajectory_Store(run['Sink'])
+        sink.Resume(self, run['Time'], run['Nb_step'], run['every'], run['Records'])
+        stream = self.Stream(run['Time'], run['Nb_step'], run['every'], run['chunk'], Path, profile=profile,
+                             monitor=monitor, progress=progress, encounters=encounters, **run['options'])
+        self.Run_Sink(stream, sink, run, Path, checkpoint_interval)
 
     def set_lim_traj(self, ax):
         """
@@ -170,61 +1036,82 @@ class System:
                 self.Trajectories[element.Name] -= self.Trajectories[self.Elements[fixed].Name]
         self.Trajectories[self.Elements[fixed].Name] = np.zeros((3, len(self.Time)))
 
-    def Animation(self, Animated_time, trail=1.0, anim_temps=True, fixed=None):
+    def Marker_Sizes(self):
         """
-        Crée une animation des trajectoires et des températures des corps sur une période donnée.
+        Taille [px] du marqueur de chaque corps, croissant avec le logarithme de son rayon.
+        """
+        px_max = 10
+        px_min = 2
+        if self.max_size==self.min_size:
+            return [int((px_min+px_max)/2) for element in self.Elements]
+        a = (px_max - px_min) / (self.max_size - self.min_size)
+        b = self.max_size - px_max / a
+        return [int(a * (np.log(element.Radius) - b)) for element in self.Elements]
+
+    def Frame_Count(self, Animated_time):
         """
+        Nombre de frames (à 60 images par seconde) d'une animation de Animated_time secondes.
+        """
+        recorded = len(self.Time) if np.ndim(self.Time) else 0  # Aucun pas enregistré avant la simulation
+        return int(60 * min(Animated_time, recorded / 60))
+
+    def Animation_Figures(self, Animated_time, trail=1.0, anim_temps=True, fixed=None, max_vertices=2000, figure=None):
+        """
+        Prépare les figures de l'animation et leurs fonctions de mise à jour, créées par figure(nom, **options)
+        (plt.figure par défaut). Renvoie le nombre de frames et la liste des (nom, figure, mise à jour(frame)).
+        """
+        if figure is None:
+            import matplotlib.pyplot as plt
+            figure = plt.figure
         Nb_step = len(self.Time)
-        Animated_time = min(Animated_time, Nb_step / 60)
-        Nb_frames = int(60 * Animated_time)
-        Time_step = 1e3 / 60
+        Nb_frames = self.Frame_Count(Animated_time)
         ratio = Nb_step / Nb_frames
 
         # Centrer les éléments si nécessaire
         self.center_elements(fixed)
         
         ### Animation des trajectoires ###
-        fig = plt.figure('Trajectories')
+        fig = figure('Trajectories')
         ax = fig.add_subplot(projection="3d")
         self.set_lim_traj(ax)
         ax.set_title('Trajectories')
-        px_max = 10
-        px_min = 2
-        a = (px_max - px_min) / (self.max_size - self.min_size)
-        b = self.max_size - px_max / a
 
+        budget = max(2, max_vertices // len(self.Elements))  # Sommets par traînée et par frame
+        trails = [Trail_LOD(self.Trajectories[element.Name], budget) for element in self.Elements]
         traj_lines = [ax.plot([], [], [], linestyle='dashed', color=element.Color)[0] for element in self.Elements]
-        if self.max_size==self.min_size:
-            traj_objects = [ax.plot([], [], [], marker='o', markersize=int((px_min+px_max)/2), color=element.Color, label=element.Name)[0] for element in self.Elements]
-        else:
-            traj_objects = [ax.plot([], [], [], marker='o', markersize=int(a * (np.log(element.Radius) - b)), color=element.Color, label=element.Name)[0] for element in self.Elements]
+        traj_objects = [ax.plot([], [], [], marker='o', markersize=size, color=element.Color, label=element.Name)[0]
+                        for element, size in zip(self.Elements, self.Marker_Sizes())]
         ax.legend()
 
         def update_trajectories(frame):
             """
             Met à jour les trajectoires pour chaque frame d'animation.
             """
-            for line, obj, element in zip(traj_lines, traj_objects, self.Elements):
+            for line, obj, element, lod in zip(traj_lines, traj_objects, self.Elements, trails):
                 idx_start = int(frame * ratio * (1 - trail))
                 idx_end = int(frame * ratio)
-                line.set_data_3d(self.Trajectories[element.Name][:, idx_start:idx_end])
+                line.set_data_3d(lod.Window(idx_start, idx_end))
                 obj.set_data_3d(self.Trajectories[element.Name][:, idx_end].reshape(3, 1))
             return traj_lines + traj_objects
 
-        ani_traj = FuncAnimation(fig, update_trajectories, frames=Nb_frames, interval=Time_step, blit=True)
+        figures = [('trajectories', fig, update_trajectories)]
 
         ### Animation des températures ###
         if anim_temps:
-            fig_temps, ax_temps, lines_temps = {}, {}, {}
+            fig_temps, ax_temps, lines_temps, series = {}, {}, {}, {}
+            time_range = [np.min(self.Time), np.max(self.Time)]
 
             for element in self.Elements:
-                fig_temps[element.Name] = plt.figure(f'{element.Name} Temperature', figsize=(6, 4))
+                celsius = self.Temperatures[element.Name] - 273.0  # Une seule copie par corps, en °C
+                series[element.Name] = Series_LOD(self.Time, celsius, max_vertices)
+                low, high = np.min(celsius), np.max(celsius)
+                fig_temps[element.Name] = figure(f'{element.Name} Temperature', figsize=(6, 4))
                 ax_temps[element.Name] = fig_temps[element.Name].add_subplot(111)
-                ax_temps[element.Name].set_xlim([np.min(self.Time), np.max(self.Time)])
-                if element.Albedo != 1.0:  # La température de l'étoile est constante
-                    ax_temps[element.Name].set_ylim([np.min(self.Temperatures[element.Name] - 273.0), np.max(self.Temperatures[element.Name] - 273.0)])
-                else:
-                    ax_temps[element.Name].set_ylim([np.min(self.Temperatures[element.Name] - 323.0), np.max(self.Temperatures[element.Name] - 223.0)])
+                ax_temps[element.Name].set_xlim(time_range)
+                if element.Albedo != 1.0:
+                    ax_temps[element.Name].set_ylim([low, high])
+                else:  # La température de l'étoile est constante
+                    ax_temps[element.Name].set_ylim([low - 50.0, high + 50.0])
                 ax_temps[element.Name].set_xlabel('Time [Year]')
                 ax_temps[element.Name].set_ylabel('Temperature [°C]')
                 ax_temps[element.Name].set_title(f'{element.Name} Temperature')
@@ -236,11 +1123,217 @@ class System:
                 """
                 idx = int(frame * ratio)
                 for element in self.Elements:
-                    t_data = self.Time[:idx]
-                    temp_data = self.Temperatures[element.Name][:idx] - 273
+                    t_data, temp_data = series[element.Name].Window(idx)
                     lines_temps[element.Name].set_data(t_data, temp_data)
                 return list(lines_temps.values())
 
-            ani_temp = FuncAnimation(fig_temps[element.Name], update_temp, frames=Nb_frames, interval=Time_step, blit=True)
+            figures += [(f'{element.Name} temperature', fig_temps[element.Name], update_temp) for element in self.Elements]
+        return Nb_frames, figures
+
+    def Animation(self, Animated_time, trail=1.0, anim_temps=True, fixed=None, max_vertices=2000):
+        """
+        Crée une animation des trajectoires et des températures des corps sur une période donnée.
+        Chaque frame affiche au plus max_vertices sommets de traînée (répartis entre les corps) et autant
+        de points par courbe de température, quel que soit le nombre de pas enregistrés.
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+        Nb_frames, figures = self.Animation_Figures(Animated_time, trail, anim_temps, fixed, max_vertices)
+        Time_step = 1e3 / 60
+
+        name, fig, update_trajectories = figures[0]
+        ani_traj = FuncAnimation(fig, update_trajectories, frames=Nb_frames, interval=Time_step, blit=True)
+        if anim_temps:
+            name, fig, update_temp = figures[-1]
+            ani_temp = FuncAnimation(fig, update_temp, frames=Nb_frames, interval=Time_step, blit=True)
 
         plt.show()
+
+    def Export(self, Path, Animated_time, trail=1.0, anim_temps=False, fixed=None, max_vertices=2000, workers=None, dpi=100):
+        """
+        Exporte l'animation sans affichage (backend Agg) : Path se terminant par .mp4 (ffmpeg) ou .gif,
+        ou dossier recevant une image PNG par frame. Avec anim_temps, chaque courbe de température est
+        exportée à côté (suffixe _<corps>_temperature). Les frames sont réparties par tranches contiguës
+        entre workers processus (tous les coeurs par défaut). Renvoie la liste des fichiers ou dossiers écrits.
+        """
+        import shutil
+        import tempfile
+        import subprocess
+        import multiprocessing
+        import matplotlib
+        from PIL import Image
+        from concurrent.futures import ProcessPoolExecutor
+        root, extension = os.path.splitext(os.fspath(Path))
+        if extension.lower() not in ('.mp4', '.gif', ''):
+            raise ValueError(f"Format d'export inconnu : {extension} (.mp4, .gif ou dossier d'images PNG)")
+        ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+        if extension.lower() == '.mp4' and ffmpeg is None:
+            raise RuntimeError("ffmpeg est introuvable : exporter en .gif ou en images PNG")
+
+        Nb_frames = self.Frame_Count(Animated_time)
+        if Nb_frames < 1:
+            raise ValueError(f"Aucune frame à exporter (Animated_time = {Animated_time} s) : lancer la simulation "
+                             f"et exporter au moins 1/60 s d'animation")
+        directory = root if extension == '' else tempfile.mkdtemp(prefix='frames_')
+        os.makedirs(directory, exist_ok=True)
+        options = dict(Animated_time=Animated_time, trail=trail, anim_temps=anim_temps, fixed=fixed,
+                       max_vertices=max_vertices)
+        workers = max(1, min(workers or os.cpu_count() or 1, Nb_frames))
+        slices = np.array_split(np.arange(Nb_frames), workers)
+
+        # Les processus sont créés par fork : l'initialiseur leur transmet le système sans copie ni sérialisation
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'),
+                                     initializer=Init_render, initargs=(self,)) as executor:
+                names = list(executor.map(Render_frames, slices, [directory] * workers, [options] * workers,
+                                          [dpi] * workers))[0]
+        else:
+            names = Render_frames(np.arange(Nb_frames), directory, options, dpi, self)
+
+        outputs = []
+        for k, name in enumerate(names):
+            pattern = os.path.join(directory, f'{name}_%05d.png')
+            output = Path if k == 0 or extension == '' else f'{root}_{name}{extension}'
+            if extension.lower() == '.mp4':
+                subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-framerate', '60', '-i', pattern,
+                                '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', output], check=True)
+            elif extension.lower() == '.gif':
+                frames = (Image.open(pattern % frame) for frame in range(1, Nb_frames))
+                Image.open(pattern % 0).save(output, save_all=True, append_images=frames, duration=1000 / 60, loop=0)
+            if output not in outputs:
+                outputs.append(output)
+        if extension != '':
+            shutil.rmtree(directory)
+        print(f"Animation exportée ({Nb_frames} frames, {workers} processus) : {', '.join(map(str, outputs))}")
+        return outputs
+
+    def Live(self, Time, Nb_step, every=1, chunk=16, queue_size=8, trail=500, anim_temps=True, fixed=None, **options):
+        """
+        Simule et affiche en même temps : la simulation tourne dans un fil d'exécution en arrière-plan et
+        transmet ses enregistrements par blocs de chunk via une file bornée à queue_size blocs (Queue_Sink).
+        Chaque frame affiche les blocs arrivés, avec une traînée des trail derniers enregistrements ; quand
+        l'affichage prend du retard, la file se remplit et la simulation attend. Fermer la fenêtre arrête
+        la simulation. options est transmis à Simulation (solver, integrator, ...).
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+        N = len(self.Elements)
+        sink = Queue_Sink(queue_size)
+        times, positions, temperatures = Ring_Buffer((), trail), Ring_Buffer((N, 3), trail), Ring_Buffer((N,), trail)
+        state = {'Done': False, 'Limits': (np.inf, -np.inf)}
+
+        ### Trajectoires ###
+        fig = plt.figure('Trajectories')
+        ax = fig.add_subplot(projection="3d")
+        ax.set_xlabel('X [km]')
+        ax.set_ylabel('Y [km]')
+        ax.set_zlabel('Z [km]')
+        traj_lines = [ax.plot([], [], [], linestyle='dashed', color=element.Color)[0] for element in self.Elements]
+        traj_objects = [ax.plot([], [], [], marker='o', markersize=size, color=element.Color, label=element.Name)[0]
+                        for element, size in zip(self.Elements, self.Marker_Sizes())]
+        ax.legend()
+
+        ### Températures ###
+        if anim_temps:
+            fig_temps, ax_temps, lines_temps = [], [], []
+            for element in self.Elements:
+                fig_temps.append(plt.figure(f'{element.Name} Temperature', figsize=(6, 4)))
+                ax_temps.append(fig_temps[-1].add_subplot(111))
+                ax_temps[-1].set_xlabel('Time [Year]')
+                ax_temps[-1].set_ylabel('Temperature [°C]')
+                ax_temps[-1].set_title(f'{element.Name} Temperature')
+                lines_temps.append(ax_temps[-1].plot([], [], color=element.Color)[0])
+
+        def update(frame):
+            """
+            Intègre les blocs arrivés depuis la frame précédente et met à jour les figures.
+            """
+            while not state['Done']:
+                try:
+                    block = sink.Queue.get_nowait()
+                except queue.Empty:
+                    break
+                if block is None:
+                    state['Done'] = True
+                    break
+                t_data, traj_data, temp_data = block
+                if fixed is not None:
+                    traj_data = traj_data - traj_data[fixed]
+                times.Append(t_data)
+                positions.Append(traj_data)
+                temperatures.Append(temp_data)
+            if times.Size == 0:
+                return
+
+            window = positions.Window()
+            for line, obj, trajectory in zip(traj_lines, traj_objects, window):
+                line.set_data_3d(trajectory)
+                obj.set_data_3d(trajectory[:, -1:])
+            # Les limites ne font que s'élargir, pour éviter que la vue ne tremble
+            low, high = state['Limits']
+            low, high = min(low, window.min()), max(high, window.max())
+            if (low, high) != state['Limits']:
+                state['Limits'] = (low, high)
+                ax.set_xlim([low, high])
+                ax.set_ylim([low, high])
+                ax.set_zlim([low, high])
+            ax.set_title(f"Trajectories - {times.Window()[-1]:.3f} years" + (" (done)" if state['Done'] else ""))
+
+            if anim_temps:
+                for fig_temp, ax_temp, line, temperature in zip(fig_temps, ax_temps, lines_temps, temperatures.Window()):
+                    line.set_data(times.Window(), temperature - 273)
+                    ax_temp.relim()
+                    ax_temp.autoscale_view()
+                    fig_temp.canvas.draw_idle()
+
+        def simulate():
+            try:
+                self.Simulation(Time, Nb_step, every=every, sink=sink, chunk=chunk, **options)
+            except InterruptedError:
+                pass
+
+        worker = threading.Thread(target=simulate, daemon=True)
+        worker.start()
+        ani = FuncAnimation(fig, update, interval=1e3 / 60, cache_frame_data=False)
+        try:
+            plt.show()
+        finally:
+            sink.Stop()
+            worker.join()
+
+### EXPORT ###
+def Agg_figure(name, **options):
+    """
+    Figure matplotlib privée, rendue par le backend Agg sans passer par pyplot (name est ignoré).
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(**options)
+    FigureCanvasAgg(fig)
+    return fig
+
+RENDERED = None  # Système exporté, propre à chaque processus de rendu (fixé par Init_render)
+
+def Init_render(system):
+    """
+    Initialise un processus de rendu avec le système à exporter.
+    """
+    global RENDERED
+    RENDERED = system
+
+def Render_frames(frames, Directory, options, dpi, system=None):
+    """
+    Rend une tranche de frames de l'animation de system (par défaut celui du processus de rendu)
+    en images PNG dans Directory, sur des figures privées : l'état de pyplot (backend, figures
+    ouvertes) n'est pas modifié. Renvoie les noms des figures (préfixes des fichiers).
+    """
+    Nb_frames, figures = (RENDERED if system is None else system).Animation_Figures(figure=Agg_figure, **options)
+    names = [name.replace(' ', '_') for name, fig, update in figures]
+    for frame in frames:
+        last = None
+        for name, (_, fig, update) in zip(names, figures):
+            if update is not last:  # Une seule mise à jour pour toutes les courbes de température
+                update(frame)
+                last = update
+            fig.savefig(os.path.join(Directory, f'{name}_{frame:05d}.png'), dpi=dpi)
+    return names
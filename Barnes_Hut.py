@@ -0,0 +1,189 @@
+import numpy as np
+
+### CONSTANTES ###
+MAX_DEPTH = 21  # Profondeur maximale de l'arbre (21 bits par axe dans une clé de Morton 64 bits)
+CHUNK = 2048  # Nombre de cibles parcourues simultanément (borne la mémoire du parcours)
+GROUP = 16  # Nombre de cibles voisines partageant une même liste d'interaction
+PAIRS = 2048  # Nombre de paires (groupe, noeud) évaluées par bloc dense
+
+def Morton_keys(Cells):
+    """
+    Entrelace les coordonnées entières (N,3) des cellules en clés de Morton 64 bits.
+    """
+    keys = np.zeros(len(Cells), dtype=np.uint64)
+    for axis in range(3):
+        v = Cells[:, axis].astype(np.uint64) & np.uint64(0x1fffff)
+        v = (v | v << np.uint64(32)) & np.uint64(0x1f00000000ffff)
+        v = (v | v << np.uint64(16)) & np.uint64(0x1f0000ff0000ff)
+        v = (v | v << np.uint64(8)) & np.uint64(0x100f00f00f00f00f)
+        v = (v | v << np.uint64(4)) & np.uint64(0x10c30c30c30c30c3)
+        v = (v | v << np.uint64(2)) & np.uint64(0x1249249249249249)
+        keys |= v << np.uint64(2 - axis)
+    return keys
+
+### CLASS OCTREE ###
+class Octree:
+    """
+    Octree de Barnes-Hut construit niveau par niveau à partir des clés de Morton triées.
+    Chaque noeud porte sa masse et son centre de masse.
+    """
+    def __init__(self, Positions, Masses, max_depth=MAX_DEPTH):
+        self.Depth = max_depth
+        self.Origin = np.min(Positions, axis=0)  # Coin inférieur de la boîte englobante [km]
+        self.Size = max(np.max(np.max(Positions, axis=0) - self.Origin), 1.0) * (1 + 1e-9)  # Côté [km]
+        cells = self.Cells(Positions)
+        keys = Morton_keys(cells)
+        self.Order = np.argsort(keys, kind='stable')
+        self.Sorted_Keys = keys[self.Order]
+        cells = cells[self.Order]
+        positions = Positions[self.Order]
+        masses = Masses[self.Order]
+        self.Particle_Positions = positions
+        self.Particle_Masses = masses
+
+        # Construction des niveaux jusqu'à ce que chaque noeud ne contienne plus qu'un corps
+        self.Levels = []
+        for level in range(max_depth + 1):
+            prefix = self.Sorted_Keys >> np.uint64(3 * (max_depth - level))
+            starts = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]])
+            count = np.diff(np.r_[starts, len(prefix)])
+            mass = np.add.reduceat(masses, starts)
+            center = np.add.reduceat(positions, starts, axis=0) / count[:, None]
+            weighted = np.add.reduceat(masses[:, None] * positions, starts, axis=0)
+            com = np.where(mass[:, None] > 0, weighted / np.where(mass > 0, mass, 1)[:, None], center)
+            low = self.Origin + (cells[starts] >> (max_depth - level)) * (self.Size / 2 ** level)
+            node = {'Key': prefix[starts], 'Start': starts, 'Count': count, 'Mass': mass, 'Com': com, 'Low': low}
+            self.Levels.append(node)
+            if np.max(count) == 1:
+                break
+
+        # Liens vers les enfants : les enfants d'un noeud forment une plage contiguë du niveau suivant
+        for parent, child in zip(self.Levels[:-1], self.Levels[1:]):
+            parent_keys = child['Key'] >> np.uint64(3)
+            parent['Child_Start'] = np.searchsorted(parent_keys, parent['Key'], side='left')
+            parent['Child_End'] = np.searchsorted(parent_keys, parent['Key'], side='right')
+
+    def Cells(self, Positions):
+        """
+        Coordonnées entières des positions données dans la grille la plus fine de l'arbre.
+        """
+        cells = np.floor((Positions - self.Origin) / self.Size * 2 ** self.Depth)
+        return np.clip(cells, 0, 2 ** self.Depth - 1).astype(np.int64)
+
+    def Evaluate(self, Targets, theta=0.5, Indices=None):
+        """
+        Calcule le champ Σ m_j (x_j - x_i) / r³ [kg/km²] aux positions cibles (T,3).
+        Indices donne l'indice de chaque cible dans l'arbre (ou -1) afin d'exclure l'auto-interaction.
+        """
+        T = len(Targets)
+        if Indices is None:
+            Indices = np.full(T, -1)
+        rank = np.full(len(self.Order), -1)
+        rank[self.Order] = np.arange(len(self.Order))  # Position de chaque corps dans l'ordre trié
+        sorted_indices = np.where(Indices >= 0, rank[np.maximum(Indices, 0)], -1)
+
+        # Les cibles sont triées selon l'ordre de Morton pour former des groupes compacts
+        order = np.argsort(Morton_keys(self.Cells(Targets)), kind='stable')
+        field = np.zeros((T, 3))
+        for first in range(0, T, CHUNK):
+            block = order[first:first + CHUNK]
+            field[block] = self.Walk(Targets[block], sorted_indices[block], theta)
+        return field
+
+    def Walk(self, Targets, Sorted_indices, theta):
+        """
+        Parcourt l'arbre niveau par niveau pour des groupes de cibles voisines, en ouvrant les noeuds
+        trop proches du groupe, puis applique la liste d'interaction de chaque groupe à ses membres.
+        """
+        T = len(Targets)
+        nb_groups = -(-T // GROUP)
+        padding = nb_groups * GROUP - T  # Les groupes sont complétés en répétant la dernière cible
+        members = np.concatenate([Targets, np.repeat(Targets[-1:], padding, axis=0)]).reshape(nb_groups, GROUP, 3)
+        owners = np.concatenate([Sorted_indices, np.full(padding, -1)]).reshape(nb_groups, GROUP)
+        low = members.min(axis=1)  # Boîte englobante de chaque groupe
+        high = members.max(axis=1)
+        field = np.zeros((nb_groups, GROUP, 3))
+
+        group = np.arange(nb_groups)
+        node = np.zeros(nb_groups, dtype=int)
+        for level, data in enumerate(self.Levels):
+            if group.size == 0:
+                break
+            last = level == len(self.Levels) - 1
+            side = self.Size / 2 ** level
+            com = data['Com'][node]
+            gap = np.maximum(0, np.maximum(low[group] - com, com - high[group]))
+            dist2 = np.einsum('pk,pk->p', gap, gap)  # Distance du centre de masse à la boîte du groupe
+            cell = data['Low'][node]
+            apart = np.any((cell > high[group]) | (cell + side < low[group]), axis=1)
+            accept = (data['Count'][node] == 1) | last | (apart & (side ** 2 < theta ** 2 * dist2))
+            if np.any(accept):
+                self.Interact(data, group[accept], node[accept], last, members, owners, field)
+
+            # Ouverture des autres noeuds : chaque paire (groupe, noeud) est remplacée par ses enfants
+            opened = ~accept
+            if last or not np.any(opened):
+                break
+            start = data['Child_Start'][node[opened]]
+            nb = data['Child_End'][node[opened]] - start
+            group = np.repeat(group[opened], nb)
+            node = np.repeat(start, nb) + np.arange(nb.sum()) - np.repeat(np.cumsum(nb) - nb, nb)
+        return field.reshape(-1, 3)[:T]
+
+    def Interact(self, data, group, node, last, members, owners, field):
+        """
+        Ajoute au champ des membres de chaque groupe la contribution des noeuds acceptés,
+        par blocs denses (noeuds × membres) sommés groupe par groupe.
+        """
+        # Les paires arrivent triées par groupe : la somme par groupe se fait avec reduceat
+        for first in range(0, len(group), PAIRS):
+            g, n = group[first:first + PAIRS], node[first:first + PAIRS]
+            bounds = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+            start, count = data['Start'][n][:, None], data['Count'][n][:, None]
+            own = owners[g]
+            other = ~((count == 1) & (start == own))  # Pas d'auto-interaction
+            mass = data['Mass'][n][:, None]
+            if last:
+                # Cellule de résolution maximale : on retire la masse de la cible elle-même
+                inside = (count > 1) & (own >= start) & (own < start + count)
+                mass = mass - np.where(inside, self.Particle_Masses[np.maximum(own, 0)], 0)
+            com = data['Com'][n]
+            dx = com[:, 0, None] - members[g, :, 0]
+            dy = com[:, 1, None] - members[g, :, 1]
+            dz = com[:, 2, None] - members[g, :, 2]
+            dnorm2 = dx * dx + dy * dy + dz * dz
+            keep = other & (dnorm2 > 0)
+            weights = np.divide(mass, dnorm2 * np.sqrt(dnorm2), out=np.zeros(dnorm2.shape), where=keep)
+            field[g[bounds], :, 0] += np.add.reduceat(weights * dx, bounds, axis=0)
+            field[g[bounds], :, 1] += np.add.reduceat(weights * dy, bounds, axis=0)
+            field[g[bounds], :, 2] += np.add.reduceat(weights * dz, bounds, axis=0)
+
+def Direct_field(Positions, Masses, Targets, Indices=None):
+    """
+    Champ Σ m_j (x_j - x_i) / r³ [kg/km²] calculé par sommation directe aux positions cibles.
+    """
+    field = np.zeros((len(Targets), 3))
+    block = max(1, CHUNK * 64 // max(len(Positions), 1))
+    for first in range(0, len(Targets), block):
+        dvec = Positions[None, :, :] - Targets[first:first + block, None, :]
+        dnorm2 = np.einsum('tjk,tjk->tj', dvec, dvec)
+        if Indices is not None:
+            own = Indices[first:first + block]
+            rows = np.flatnonzero(own >= 0)
+            dnorm2[rows, own[rows]] = np.inf
+        dnorm2[dnorm2 == 0] = np.inf
+        field[first:first + block] = np.einsum('tj,tjk->tk', Masses[None, :] / dnorm2 ** 1.5, dvec)
+    return field
+
+def Force_Error(Positions, Masses, theta=0.5, sample=256, seed=0):
+    """
+    Erreur relative de la force de Barnes-Hut par rapport à la sommation directe,
+    estimée sur un échantillon de corps. Renvoie la médiane, le 99e centile et le maximum.
+    """
+    rng = np.random.default_rng(seed)
+    indices = rng.choice(len(Positions), size=min(sample, len(Positions)), replace=False)
+    tree_field = Octree(Positions, Masses).Evaluate(Positions[indices], theta, indices)
+    direct_field = Direct_field(Positions, Masses, Positions[indices], indices)
+    norm = np.linalg.norm(direct_field, axis=1)
+    error = np.linalg.norm(tree_field - direct_field, axis=1) / np.where(norm > 0, norm, 1)
+    return {'median': float(np.median(error)), 'p99': float(np.percentile(error, 99)), 'max': float(np.max(error))}
@@ -0,0 +1,289 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import importlib
+import subprocess
+import tracemalloc
+import contextlib
+import numpy as np
+from Astronomic_objects import Body, System, YEAR, NUMBA_AVAILABLE
+from Conservation import Energy
+
+### CONSTANTES ###
+MS = 1.98892e30  # Masse du Soleil (kg)
+AU = 1.496e8  # 1 Unité Astronomique en kilomètres (km)
+DAY = 24 * 3600  # Un jour en secondes
+
+### SYSTEMES ###
+# Scénarios : module, durée [s] et nombre de pas de leur simulation, dont on garde le pas de temps.
+SCENARIOS = {
+    'Terre-Soleil': ('Terre-Soleil', 365 * 24 * 3600, 365),
+    'Jupiter': ('Jupiter', 100 * DAY, 10000),
+    'Trisolar': ('Trisolar', 25 * YEAR, 25000),
+    'Gamma_Cephei': ('Gamma_Cephei', 100 * YEAR, 50000),
+    'Solar_system': ('Solar_system', 250 * YEAR, 10000),
+    'Solar_system2': ('Solar_system2', 10 * YEAR, 10000),
+    'Alpha_Centori_System': ('Alpha_Centori_System', 100 * YEAR, 1000),
+}
+SYNTHETIC_SIZES = [10, 100, 1000, 10000, 100000]
+
+def Synthetic_System(N, seed=0, engine='packed', backend='numpy'):
+    """
+    Système synthétique de N corps : une étoile et N - 1 planétésimaux sur des orbites circulaires
+    quasi coplanaires entre 0.5 et 50 UA.
+    """
+    rng = np.random.default_rng(seed)
+    radius = AU * np.exp(rng.uniform(np.log(0.5), np.log(50), N - 1))
+    angle = rng.uniform(0, 2 * np.pi, N - 1)
+    height = rng.normal(0, 0.01, N - 1) * radius
+    speed = np.sqrt(6.67430e-20 * MS / radius)  # Vitesse circulaire [km/s]
+    elements = [Body(Name='Star', Position=np.zeros(3), Velocity=np.zeros(3), Mass=MS,
+                     Radius=696340, Temperature=5778, Albedo=1.0, Emissivity=0.95, Color='gold')]
+    for k in range(N - 1):
+        elements.append(Body(Name=f'Body{k}',
+                             Position=np.array([radius[k] * np.cos(angle[k]), radius[k] * np.sin(angle[k]), height[k]]),
+                             Velocity=np.array([-speed[k] * np.sin(angle[k]), speed[k] * np.cos(angle[k]), 0.0]),
+                             Mass=10 ** rng.uniform(18, 22),
+                             Radius=1000.0,
+                             Temperature=100,
+                             Albedo=0.3,
+                             Emissivity=0.95,
+                             Color='gray'))
+    return System(elements, engine=engine, backend=backend)
+
+def Scenario_System(name, engine='packed', backend='numpy'):
+    """
+    Système d'un scénario (sans animation), avec le moteur et le backend donnés.
+    """
+    module = importlib.import_module(SCENARIOS[name][0])
+    system = module.Create_System()
+    return System(system.Elements, engine=engine, backend=backend)
+
+### CONFIGURATIONS ###
+# Moteur, solveur, backend, et nombre maximal de corps au-delà duquel la configuration n'est pas mesurée
+# (mémoire des paires pour la sommation directe vectorisée, durée pour les boucles).
+ENGINES = [
+    ('packed', 'direct', 'numpy', 3000),
+    ('packed', 'direct', 'numba', 20000),
+    ('packed', 'barnes-hut', 'numpy', 100000),
+    ('loop', 'direct', 'numpy', 200),
+]
+INTEGRATORS = ['euler', 'leapfrog', 'yoshida4', 'rk45', 'block']
+ENERGY_LIMIT = 5000  # Au-delà, l'énergie (sommation sur toutes les paires) n'est pas calculée
+
+def Cases(systems=None, sizes=SYNTHETIC_SIZES, engines=ENGINES, integrators=INTEGRATORS):
+    """
+    Liste des cas (système, taille, moteur, solveur, backend, intégrateur) à mesurer.
+    """
+    systems = list(SCENARIOS) if systems is None else systems
+    cases = []
+    for name in systems + [f'synthetic-{N}' for N in sizes]:
+        N = None if name in SCENARIOS else int(name.split('-')[1])
+        for engine, solver, backend, limit in engines:
+            if N is not None and N > limit:
+                continue
+            if backend == 'numba' and not NUMBA_AVAILABLE:
+                continue
+            for integrator in integrators:
+                if integrator == 'block' and solver != 'direct':
+                    continue  # Le pas par blocs nécessite la sommation directe
+                cases.append(dict(system=name, engine=engine, solver=solver, backend=backend, integrator=integrator))
+    return cases
+
+def Build(case):
+    """
+    Construit le système d'un cas et renvoie (système, pas de temps [s]).
+    """
+    if case['system'] in SCENARIOS:
+        module, Time, Nb_step = SCENARIOS[case['system']]
+        return Scenario_System(case['system'], case['engine'], case['backend']), Time / Nb_step
+    return Synthetic_System(int(case['system'].split('-')[1]), engine=case['engine'], backend=case['backend']), DAY
+
+### MESURES ###
+def Run_Steps(system, Time_step, steps, seconds, case):
+    """
+    Fait au plus steps pas (arrêt après seconds secondes). Renvoie le nombre de pas faits et la durée [s].
+    """
+    stream = system.Stream(Time_step * steps, steps, 1, 1, progress=False, solver=case['solver'],
+                           integrator=case['integrator'])
+    done, start = 0, time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in stream:
+            done += 1
+            if time.perf_counter() - start > seconds:
+                break
+        stream.close()
+    return done, time.perf_counter() - start
+
+def Measure(case, steps=200, seconds=10.0, memory_steps=5):
+    """
+    Mesure un cas : pas par seconde, pic de mémoire allouée pendant la simulation et dérive relative
+    de l'énergie mécanique. La mémoire est mesurée (tracemalloc) sur une seconde exécution plus courte,
+    pour ne pas fausser la durée.
+    """
+    result = dict(case)
+    try:
+        if case['backend'] == 'numba':  # Compilation des noyaux hors mesure
+            system, Time_step = Build(case)
+            Run_Steps(system, Time_step, 2, seconds, case)
+
+        system, Time_step = Build(case)
+        result['bodies'] = len(system.Elements)
+        energy = len(system.Elements) <= ENERGY_LIMIT
+        initial = Energy(system.Positions, system.Velocities, system.Masses) if energy else None
+        done, elapsed = Run_Steps(system, Time_step, steps, seconds, case)
+        final = Energy(system.Positions, system.Velocities, system.Masses) if energy else None
+        result.update(steps=done, seconds=elapsed, steps_per_s=done / elapsed,
+                      force_evaluations=system.Force_Evaluations,
+                      energy_drift=abs(final - initial) / abs(initial) if energy else None)
+
+        system, Time_step = Build(case)
+        tracemalloc.start()
+        try:
+            Run_Steps(system, Time_step, min(memory_steps, steps), seconds, case)
+            result['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    except Exception as error:  # Un cas qui échoue est consigné sans interrompre la suite
+        result['error'] = f'{type(error).__name__}: {error}'
+    return result
+
+### DEMARRAGE A FROID ###
+# Import et simulation de Terre-Soleil dans un interpréteur neuf, comme un processus de calcul en lot :
+# ni matplotlib, ni tqdm, ni Numba ne doivent être chargés.
+COLD_START_TARGET = 0.3  # Durée visée [s]
+COLD_START_CODE = ("import sys, importlib; system = importlib.import_module('Terre-Soleil').Create_System(); "
+                   "system.Simulation(365 * 24 * 3600, 365, progress=False); "
+                   "print(','.join(name for name in ('matplotlib', 'tqdm', 'numba', 'PIL') if name in sys.modules))")
+
+def Cold_Start(repeat=5):
+    """
+    Durée médiane [s] du démarrage à froid (lancement de l'interpréteur compris) et modules lourds chargés.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', COLD_START_CODE], capture_output=True, text=True,
+                                cwd=directory, check=True).stdout.strip()
+        durations.append(time.perf_counter() - start)
+    seconds = float(np.median(durations))
+    return {'seconds': seconds, 'target': COLD_START_TARGET, 'met': seconds <= COLD_START_TARGET,
+            'heavy_modules': output.split(',') if output else []}
+
+def Environment():
+    """
+    Description de la machine et de la version du code, enregistrée avec les résultats.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': commit, 'python': platform.python_version(),
+            'numpy': np.__version__, 'numba': NUMBA_AVAILABLE, 'machine': platform.machine(),
+            'processor': platform.processor(), 'cpus': os.cpu_count()}
+
+def Benchmark(cases, Path, steps=200, seconds=10.0):
+    """
+    Mesure tous les cas et enregistre les résultats au format JSON dans Path (réécrit après chaque cas).
+    """
+    report = {'environment': Environment(), 'steps': steps, 'seconds': seconds, 'cold_start': Cold_Start(), 'results': []}
+    cold = report['cold_start']
+    print(f"Démarrage à froid (Terre-Soleil) : {cold['seconds']:.3f} s (objectif {cold['target']} s"
+          f"{'' if cold['met'] else ', dépassé'}), modules lourds chargés : {', '.join(cold['heavy_modules']) or 'aucun'}")
+    for k, case in enumerate(cases):
+        result = Measure(case, steps, seconds)
+        report['results'].append(result)
+        with open(Path, 'w') as file:
+            json.dump(report, file, indent=1)
+        if 'error' in result:
+            print(f"[{k + 1}/{len(cases)}] {Label(result)} : {result['error']}")
+        else:
+            drift = '-' if result['energy_drift'] is None else f"{result['energy_drift']:.1e}"
+            print(f"[{k + 1}/{len(cases)}] {Label(result)} : {result['steps_per_s']:.1f} pas/s, "
+                  f"{result['peak_memory_mb']:.1f} Mo, dérive {drift}")
+    return report
+
+### VERIFICATION DES PAS PAR BLOCS ###
+def Check_Block(name='Solar_system2', Time=YEAR / 4, Nb_step=50, eta=0.01, tolerance=1e-3):
+    """
+    Vérifie l'intégrateur 'block' sur un scénario : les niveaux attribués en fin de simulation doivent être
+    ceux du critère de pas recalculé sur l'état final, et l'écart des positions à un leapfrog au pas du niveau
+    le plus fin, rapporté à la distance au barycentre, doit rester sous tolerance. Lève une RuntimeError sinon.
+    """
+    block, leapfrog = Scenario_System(name), Scenario_System(name)
+    block.Simulation(Time, Nb_step, integrator='block', eta=eta, progress=False)
+    _, scales = block.Block_Forces(np.arange(len(block.Positions)), scales=True)
+    expected = block.Block_Level(scales, Time / Nb_step)
+    top = int(block.Block_Levels.max())
+    leapfrog.Simulation(Time, Nb_step * 2 ** top, integrator='leapfrog', progress=False)
+    barycentre = np.average(leapfrog.Positions, axis=0, weights=leapfrog.Masses)
+    distance = np.linalg.norm(leapfrog.Positions - barycentre, axis=1)
+    error = np.linalg.norm(block.Positions - leapfrog.Positions, axis=1) / distance
+    print(f"Pas par blocs ({name}) : niveaux {block.Block_Levels.tolist()}, écart relatif {error.max():.1e} "
+          f"(tolérance {tolerance:.0e}) au leapfrog de {Nb_step * 2 ** top} pas, {block.Force_Evaluations:.0f} "
+          f"évaluations de forces contre {leapfrog.Force_Evaluations:.0f}")
+    if not np.array_equal(block.Block_Levels, expected):
+        raise RuntimeError(f"Niveaux attribués {block.Block_Levels.tolist()} différents du critère {expected.tolist()}")
+    if error.max() > tolerance:
+        raise RuntimeError(f"Écart relatif au leapfrog {error.max():.1e} supérieur à {tolerance:.0e}")
+    return {'levels': block.Block_Levels.tolist(), 'error': float(error.max()),
+            'force_evaluations': float(block.Force_Evaluations), 'reference_evaluations': float(leapfrog.Force_Evaluations)}
+
+### COMPARAISON ###
+def Label(result):
+    return f"{result['system']} {result['engine']}/{result['solver']}/{result['backend']} {result['integrator']}"
+
+def Compare(Reference, Path):
+    """
+    Compare deux fichiers de résultats : rapport des pas par seconde et des pics de mémoire (nouveau / référence)
+    et dérives de l'énergie, pour les cas mesurés dans les deux.
+    """
+    with open(Reference) as file:
+        reference = json.load(file)
+    with open(Path) as file:
+        report = json.load(file)
+    before = {Label(result): result for result in reference['results'] if 'error' not in result}
+    after = {Label(result): result for result in report['results'] if 'error' not in result}
+    if 'cold_start' in reference and 'cold_start' in report:
+        print(f"Démarrage à froid : {reference['cold_start']['seconds']:.3f} s -> {report['cold_start']['seconds']:.3f} s")
+    ratios = []
+    print(f"{'cas':<60} {'vitesse':>8} {'mémoire':>8} {'dérive avant':>13} {'dérive après':>13}")
+    for label in [label for label in after if label in before]:
+        old, new = before[label], after[label]
+        speed = new['steps_per_s'] / old['steps_per_s']
+        memory = new['peak_memory_mb'] / max(old['peak_memory_mb'], 1e-9)
+        drifts = ['-' if result['energy_drift'] is None else f"{result['energy_drift']:.1e}" for result in (old, new)]
+        print(f"{label:<60} {speed:>7.2f}x {memory:>7.2f}x {drifts[0]:>13} {drifts[1]:>13}")
+        ratios.append(speed)
+    if ratios:
+        print(f"Vitesse : moyenne géométrique {np.exp(np.mean(np.log(ratios))):.2f}x sur {len(ratios)} cas")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mesure des performances des scénarios et de systèmes synthétiques")
+    parser.add_argument('--output', default='benchmark.json', help="fichier JSON des résultats")
+    parser.add_argument('--compare', metavar='REFERENCE', help="fichier de résultats de référence à comparer à --output")
+    parser.add_argument('--systems', nargs='*', default=None, help="scénarios à mesurer (tous par défaut)")
+    parser.add_argument('--sizes', nargs='*', type=int, default=SYNTHETIC_SIZES, help="tailles des systèmes synthétiques")
+    parser.add_argument('--integrators', nargs='*', default=INTEGRATORS)
+    parser.add_argument('--steps', type=int, default=200, help="nombre maximal de pas par cas")
+    parser.add_argument('--seconds', type=float, default=10.0, help="durée maximale d'un cas [s]")
+    parser.add_argument('--no-run', action='store_true', help="comparer --compare à --output sans rien mesurer")
+    parser.add_argument('--quick', action='store_true', help="20 pas, 2 secondes par cas, jusqu'à 1000 corps")
+    parser.add_argument('--check', action='store_true', help="vérifier d'abord les niveaux et la précision des pas par blocs")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.steps, args.seconds = 20, 2.0
+        args.sizes = [N for N in args.sizes if N <= 1000]
+    if args.check:
+        Check_Block()
+    if not args.no_run:
+        Benchmark(Cases(args.systems, args.sizes, ENGINES, args.integrators), args.output, args.steps, args.seconds)
+    if args.compare:
+        Compare(args.compare, args.output)
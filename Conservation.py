@@ -0,0 +1,118 @@
+import numpy as np
+from Astronomic_objects import G
+
+### GRANDEURS CONSERVEES ###
+# Positions en km, vitesses en km/s, masses en kg : les grandeurs sont renvoyées en unités SI.
+
+def Kinetic_Energy(Velocities, Masses):
+    """
+    Énergie cinétique totale [J].
+    """
+    return 0.5 * np.sum(Masses * np.einsum('ik,ik->i', Velocities, Velocities)) * 1e6
+
+def Potential_Energy(Positions, Masses, block=None):
+    """
+    Énergie potentielle de gravitation [J], sommée par blocs de lignes pour borner la mémoire
+    (environ 4 millions de paires à la fois). Les particules test (masse nulle) n'y contribuent pas.
+    """
+    massive = Masses > 0
+    Positions, Masses = Positions[massive], Masses[massive]
+    N = len(Masses)
+    block = block or max(1, 2 ** 22 // max(N, 1))
+    total = 0.0
+    for start in range(0, N, block):
+        rows = np.arange(start, min(start + block, N))
+        dvec = Positions[rows, None, :] - Positions[None, :, :]
+        dnorm = np.sqrt(np.einsum('ijk,ijk->ij', dvec, dvec)) * 1e3  # Distances en mètres
+        upper = np.arange(N)[None, :] > rows[:, None]  # Paires i < j seulement
+        total += np.sum(np.where(upper, Masses[rows, None] * Masses[None, :] / np.where(upper, dnorm, 1), 0))
+    return -G * total
+
+def Energy(Positions, Velocities, Masses):
+    """
+    Énergie mécanique totale [J] : énergie cinétique et énergie potentielle de gravitation.
+    """
+    return Kinetic_Energy(Velocities, Masses) + Potential_Energy(Positions, Masses)
+
+def Momentum(Velocities, Masses):
+    """
+    Quantité de mouvement totale [kg.m/s] (3,).
+    """
+    return Masses @ Velocities * 1e3
+
+def Angular_Momentum(Positions, Velocities, Masses):
+    """
+    Moment cinétique total par rapport à l'origine [kg.m2/s] (3,).
+    """
+    return Masses @ np.cross(Positions, Velocities) * 1e6
+
+### CLASS MONITOR ###
+class Monitor:
+    """
+    Suivi de l'énergie, de la quantité de mouvement et du moment cinétique tous les every pas
+    (System.Simulation(..., monitor=Monitor(...))). Le terme potentiel réutilise les distances des paires
+    calculées pour les forces du pas quand elles sont disponibles (moteur 'packed', sommation directe NumPy).
+    Quand la dérive relative de l'énergie dépasse threshold, action 'warn' l'affiche (une fois) et 'abort'
+    arrête la simulation (RuntimeError).
+    """
+    def __init__(self, every=100, threshold=1e-3, action='warn'):
+        if action not in ('warn', 'abort'):
+            raise ValueError(f"Action inconnue : {action}")
+        self.Every = every
+        self.Threshold = threshold
+        self.Action = action
+        self.History = {'Step': [], 'Energy': [], 'Drift': [], 'Momentum': [], 'Angular_Momentum': []}
+
+    def Start(self, System):
+        """
+        Mémorise l'état de référence du système au début de la simulation.
+        """
+        self.Pair_Masses = None  # Produits m_i m_j des paires, calculés au premier usage
+        self.Warned = False
+        self.Initial_Energy = Energy(System.Positions, System.Velocities, System.Masses)
+        self.Initial_Momentum = Momentum(System.Velocities, System.Masses)
+        self.Initial_Angular_Momentum = Angular_Momentum(System.Positions, System.Velocities, System.Masses)
+        # Échelles de normalisation : la quantité de mouvement totale est souvent nulle
+        self.Momentum_Scale = np.sum(System.Masses * np.linalg.norm(System.Velocities, axis=1)) * 1e3
+        self.Angular_Scale = max(np.linalg.norm(self.Initial_Angular_Momentum), 1e-300)
+
+    def Potential(self, System):
+        """
+        Énergie potentielle, à partir de la géométrie des paires si elle correspond aux positions actuelles.
+        """
+        if System.Engine == 'packed' and System.Solver == 'direct' and System.Geometry is not None:
+            if self.Pair_Masses is None or len(self.Pair_Masses) != len(System.Pair_I):  # Après une fusion
+                self.Pair_Masses = System.Masses[System.Pair_I] * System.Masses[System.Pair_J]
+            dvec, dnorm, inv3 = System.Geometry
+            return -G * np.dot(self.Pair_Masses, 1 / dnorm)
+        return Potential_Energy(System.Positions, System.Masses)
+
+    def Check(self, System, step):
+        """
+        Mesure les grandeurs conservées au pas step et réagit si l'énergie a trop dérivé.
+        """
+        energy = Kinetic_Energy(System.Velocities, System.Masses) + self.Potential(System)
+        drift = abs(energy - self.Initial_Energy) / abs(self.Initial_Energy)
+        momentum = np.linalg.norm(Momentum(System.Velocities, System.Masses) - self.Initial_Momentum) / self.Momentum_Scale
+        angular = np.linalg.norm(Angular_Momentum(System.Positions, System.Velocities, System.Masses)
+                                 - self.Initial_Angular_Momentum) / self.Angular_Scale
+        for key, value in zip(self.History, (step, energy, drift, momentum, angular)):
+            self.History[key].append(float(value))
+
+        if drift > self.Threshold:
+            message = (f"Dérive relative de l'énergie {drift:.2e} au pas {step} (seuil {self.Threshold:.0e}), "
+                       f"quantité de mouvement {momentum:.1e}, moment cinétique {angular:.1e}")
+            if self.Action == 'abort':
+                raise RuntimeError(f"Simulation interrompue : {message}")
+            if not self.Warned:
+                print(f"Attention : {message}")
+                self.Warned = True
+
+    def Report(self):
+        """
+        Affiche les dérives maximales relevées.
+        """
+        if self.History['Step']:
+            print(f"Dérives relatives maximales ({len(self.History['Step'])} mesures) : énergie "
+                  f"{max(self.History['Drift']):.2e}, quantité de mouvement {max(self.History['Momentum']):.2e}, "
+                  f"moment cinétique {max(self.History['Angular_Momentum']):.2e}")
@@ -0,0 +1,252 @@
+import numpy as np
+from Astronomic_objects import YEAR
+
+RESPONSES = ['log', 'merge', 'bounce', 'refine']  # Réponses possibles à une collision
+
+### PHASE LARGE ###
+BLOCK = 2 ** 22  # Paires candidates examinées à la fois (mémoire bornée)
+
+def Expand(Start, Count):
+    """
+    Parcourt par blocs d'au plus BLOCK paires les plages [Start[i], Start[i] + Count[i]) : renvoie, pour chaque
+    bloc, les indices i et les positions dans la plage correspondante.
+    """
+    total = np.cumsum(Count)
+    first = 0
+    while first < len(Count):
+        last = max(int(np.searchsorted(total, (total[first - 1] if first else 0) + BLOCK, side='right')), first + 1)
+        count = Count[first:last]
+        rows = np.repeat(np.arange(first, last), count)
+        yield rows, np.repeat(Start[first:last], count) + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        first = last
+
+def Overlap(Low, High, I, Low_other, High_other, J):
+    """
+    Masque des paires (I, J) de boîtes qui se chevauchent sur les trois axes.
+    """
+    return np.all((Low[I] <= High_other[J]) & (Low_other[J] <= High[I]), axis=1)
+
+def Sweep_pairs(Low, High):
+    """
+    Paires (i, j) de boîtes alignées sur les axes (N,3) qui se chevauchent, par tri et balayage le long de l'axe
+    le plus étendu : O(N log N + K) pour K paires candidates, au lieu des N² paires.
+    """
+    N = len(Low)
+    if N < 2:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    axis = int(np.argmax(np.ptp(Low + High, axis=0)))
+    order = np.argsort(Low[:, axis], kind='stable')
+    low, high = Low[order, axis], High[order, axis]
+    end = np.searchsorted(low, high, side='right')  # Boîtes qui commencent avant la fin de chaque boîte
+    I, J = [], []
+    for first, second in Expand(np.arange(N) + 1, np.maximum(end - np.arange(N) - 1, 0)):
+        a, b = order[first], order[second]
+        keep = Overlap(Low, High, a, Low, High, b)
+        I.append(a[keep])
+        J.append(b[keep])
+    return np.concatenate(I), np.concatenate(J)
+
+def Sweep_cross(Low, High, Low_other, High_other):
+    """
+    Paires (i, j) d'une boîte i du premier ensemble et d'une boîte j du second qui se chevauchent : le second
+    ensemble est trié une fois et chaque boîte du premier n'examine que les boîtes dont le début tombe dans
+    sa plage, élargie de la plus grande largeur du second ensemble.
+    """
+    if len(Low) == 0 or len(Low_other) == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    axis = int(np.argmax(np.ptp(Low_other + High_other, axis=0)))
+    order = np.argsort(Low_other[:, axis], kind='stable')
+    low = Low_other[order, axis]
+    width = np.max(High_other[:, axis] - Low_other[:, axis])
+    start = np.searchsorted(low, Low[:, axis] - width, side='left')
+    end = np.searchsorted(low, High[:, axis], side='right')
+    I, J = [], []
+    for first, second in Expand(start, end - start):
+        b = order[second]
+        keep = Overlap(Low, High, first, Low_other, High_other, b)
+        I.append(first[keep])
+        J.append(b[keep])
+    return np.concatenate(I), np.concatenate(J)
+
+def Closest_approach(Start, End):
+    """
+    Plus courte distance [km] entre deux corps en mouvement rectiligne pendant le pas, à partir de leurs
+    séparations au début et à la fin du pas (K,3), et la séparation correspondante (K,3).
+    """
+    motion = End - Start
+    length2 = np.einsum('ik,ik->i', motion, motion)
+    t = np.clip(-np.einsum('ik,ik->i', Start, motion) / np.where(length2 > 0, length2, 1), 0, 1)
+    closest = Start + t[:, None] * motion
+    return np.sqrt(np.einsum('ik,ik->i', closest, closest)), closest
+
+### CLASS ENCOUNTERS ###
+class Encounters:
+    """
+    Détection des rencontres proches et des collisions à chaque pas (System.Simulation(..., encounters=...)).
+    Phase large : tri et balayage des boîtes qui englobent le déplacement de chaque corps pendant le pas,
+    élargies de factor rayons ; phase fine : plus courte distance des paires candidates sur leur mouvement
+    pendant le pas, si bien qu'un corps ne peut pas en traverser un autre sans être vu. Les particules test
+    ne sont comparées qu'aux corps massifs, et entre elles seulement avec particle_pairs=True.
+    Une rencontre (distance < factor (R_i + R_j)) est consignée quand elle commence, une collision
+    (distance < R_i + R_j) à chaque pas, avec la réponse response :
+    'log' (rien d'autre), 'merge' (fusion des corps, voir System.Merge ; une particule test est absorbée),
+    'bounce' (rebond de coefficient de restitution restitution), ou 'refine' : dès qu'une rencontre
+    est détectée, le pas est refait en 2**n sous-pas (n <= max_refine) pour que le déplacement relatif
+    de chaque paire par sous-pas reste inférieur à eta fois leur distance.
+    """
+    def __init__(self, response='log', factor=3.0, restitution=1.0, eta=0.1, max_refine=8, particle_pairs=False):
+        if response not in RESPONSES:
+            raise ValueError(f"Réponse inconnue : {response}")
+        self.Response = response
+        self.Factor = factor
+        self.Restitution = restitution
+        self.Eta = eta
+        self.Max_Refine = max_refine
+        self.Particle_Pairs = particle_pairs
+        self.Events = []  # Step, Time [années], Kind ('encounter' ou 'collision'), Bodies, Distance [km], Response
+        self.Current = set()  # Paires en rencontre au pas précédent (identifiants des deux lignes)
+        self.Keys, self.Keys_State = None, None  # Identifiant stable de chaque ligne, pour un état donné
+        self.Refined = self.Substeps = 0  # Pas refaits et nombre total de leurs sous-pas
+
+    def Start_Step(self, System):
+        """
+        Mémorise l'état au début du pas, pour suivre le mouvement des corps et refaire le pas au besoin.
+        """
+        self.Start = System.Positions.copy(), System.Velocities.copy()
+
+    def Row_Keys(self, System):
+        """
+        Identifiant de chaque ligne de l'état qui ne change pas quand l'état est reconstruit après une fusion :
+        indice du corps dans System.Elements, ou numéro d'origine de la particule test décalé par population.
+        """
+        if self.Keys_State is not System.Positions:
+            index = {id(element): k for k, element in enumerate(System.Elements)}
+            keys = [np.array([index[id(element)] for element in System.Bodies], dtype=np.int64)]
+            for k, population in enumerate(System.Particles):
+                keys.append(len(System.Elements) + (k << 40) + population.Ids)
+            self.Keys, self.Keys_State = np.concatenate(keys), System.Positions
+        return self.Keys
+
+    def Names(self, System, rows):
+        """
+        Nom de chaque ligne de l'état : nom du corps, ou nom de la population et numéro de la particule test.
+        """
+        names = []
+        for row in rows:
+            if row < System.Nb_bodies:
+                names.append(System.Bodies[row].Name)
+                continue
+            for population in System.Particles:
+                if population.Rows.start <= row < population.Rows.stop:
+                    names.append(f"{population.Name}[{population.Ids[row - population.Rows.start]}]")
+        return names
+
+    def Detect(self, System):
+        """
+        Paires (I, J) en rencontre pendant le pas, avec leur plus courte distance [km], la séparation
+        correspondante (K,3) et leur distance de contact R_i + R_j [km].
+        """
+        x0, x1 = self.Start[0], System.Positions
+        reach = self.Factor * System.Radii[:, None]
+        low, high = np.minimum(x0, x1) - reach, np.maximum(x0, x1) + reach
+        N = System.Nb_bodies
+        I, J = Sweep_pairs(low[:N], high[:N])
+        if len(x0) > N:
+            A, B = Sweep_cross(low[:N], high[:N], low[N:], high[N:])
+            I, J = np.concatenate([I, A]), np.concatenate([J, B + N])
+            if self.Particle_Pairs:
+                A, B = Sweep_pairs(low[N:], high[N:])
+                I, J = np.concatenate([I, A + N]), np.concatenate([J, B + N])
+        distance, closest = Closest_approach(x0[I] - x0[J], x1[I] - x1[J])
+        contact = System.Radii[I] + System.Radii[J]
+        near = distance < self.Factor * contact
+        return I[near], J[near], distance[near], closest[near], contact[near]
+
+    def Check(self, System, step, Time_step):
+        """
+        Détecte les rencontres du pas step qui vient d'être fait, les consigne et applique la réponse.
+        """
+        I, J, distance, closest, contact = self.Detect(System)
+        collision = distance < contact
+        both_particles = (I >= System.Nb_bodies) & (J >= System.Nb_bodies)
+        keys = self.Row_Keys(System)
+        pairs = list(zip(np.minimum(keys[I], keys[J]).tolist(), np.maximum(keys[I], keys[J]).tolist()))
+        new = np.array([pair not in self.Current for pair in pairs], dtype=bool)
+        logged = np.flatnonzero(collision | new)  # Collisions et débuts de rencontre
+        for a, b, k in zip(self.Names(System, I[logged]), self.Names(System, J[logged]), logged):
+            response = self.Response if collision[k] or self.Response == 'refine' else 'log'
+            if response == 'merge' and both_particles[k]:
+                response = 'log'  # Deux particules test sans masse ne fusionnent pas
+            self.Events.append({'Step': step, 'Time': (step + 1) * Time_step / YEAR,
+                                'Kind': 'collision' if collision[k] else 'encounter', 'Bodies': tuple(sorted((a, b))),
+                                'Distance': float(distance[k]), 'Response': response})
+        self.Current = set(pairs)
+
+        if self.Response == 'refine' and len(I):
+            self.Refine(System, I, J, distance, Time_step)
+        elif self.Response == 'merge' and np.any(collision & ~both_particles):
+            self.Merge(System, I[collision], J[collision], distance[collision])
+        elif self.Response == 'bounce' and np.any(collision):
+            self.Bounce(System, I[collision], J[collision], closest[collision], contact[collision])
+
+    def Refine(self, System, I, J, distance, Time_step):
+        """
+        Refait le pas en 2**n sous-pas, à partir de l'état mémorisé au début du pas.
+        """
+        x0, v0 = self.Start
+        x1 = System.Positions
+        relative = np.linalg.norm((x1[I] - x0[I]) - (x1[J] - x0[J]), axis=1)  # Déplacement relatif [km]
+        ratio = np.max(relative / (self.Eta * np.maximum(distance, 1e-300)))
+        level = int(np.clip(np.ceil(np.log2(max(ratio, 1.0))), 1, self.Max_Refine))
+        System.Positions[:], System.Velocities[:] = x0, v0
+        System.Invalidate()
+        for _ in range(2 ** level):
+            System.Gravitation_law()
+            System.Transition(Time_step / 2 ** level)
+        self.Refined += 1
+        self.Substeps += 2 ** level
+
+    def Merge(self, System, I, J, distance):
+        """
+        Fusionne les paires de corps massifs en collision, de la plus proche à la plus lointaine, un corps ne
+        fusionnant qu'une fois par pas ; une particule test qui heurte un corps massif est absorbée.
+        """
+        N = System.Nb_bodies
+        used, pairs, particles = set(), [], set()
+        for i, j in zip(I[np.argsort(distance)], J[np.argsort(distance)]):
+            if i >= N and j >= N:
+                continue
+            if i >= N or j >= N:
+                particles.add(max(i, j))
+            elif i not in used and j not in used:
+                survivor, absorbed = (i, j) if System.Masses[i] >= System.Masses[j] else (j, i)
+                pairs.append((survivor, absorbed))
+                used.update((i, j))
+        System.Merge(pairs, sorted(particles))
+
+    def Bounce(self, System, I, J, closest, contact):
+        """
+        Rebond des paires en collision : impulsion le long de la ligne des centres au plus près, de coefficient
+        de restitution Restitution, puis séparation des corps jusqu'au contact autour de leur centre de masse.
+        """
+        x, v = System.Positions, System.Velocities
+        separation = x[I] - x[J]
+        normal = np.where(np.any(closest != 0, axis=1)[:, None], closest, separation)
+        normal /= np.linalg.norm(normal, axis=1)[:, None]
+        m_i, m_j = System.Inertial_Masses[I], System.Inertial_Masses[J]
+        approach = np.einsum('ik,ik->i', v[I] - v[J], normal)
+        impulse = np.where(approach < 0, -(1 + self.Restitution) * approach / (1 / m_i + 1 / m_j), 0)
+        np.add.at(v, I, (impulse / m_i)[:, None] * normal)
+        np.add.at(v, J, -(impulse / m_j)[:, None] * normal)
+        overlap = np.maximum(contact - np.einsum('ik,ik->i', separation, normal), 0)
+        np.add.at(x, I, (overlap * m_j / (m_i + m_j))[:, None] * normal)
+        np.add.at(x, J, -(overlap * m_i / (m_i + m_j))[:, None] * normal)
+        System.Invalidate()
+
+    def Report(self):
+        """
+        Affiche le nombre de rencontres, de collisions et de pas raffinés.
+        """
+        kinds = [event['Kind'] for event in self.Events]
+        print(f"Rencontres : {kinds.count('encounter')} rencontre(s), {kinds.count('collision')} collision(s), "
+              f"{self.Refined} pas raffiné(s) ({self.Substeps} sous-pas)")
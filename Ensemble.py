@@ -0,0 +1,157 @@
+import numpy as np
+from Astronomic_objects import G, YEAR, YOSHIDA_KICKS, YOSHIDA_DRIFTS
+
+### CLASS ENSEMBLE ###
+class Ensemble:
+    """
+    Ensemble de M variantes d'un même système (même nombre de corps, conditions initiales ou paramètres
+    différents), intégrées ensemble sur un état (M,N,3) par un seul noyau vectorisé.
+    """
+    def __init__(self, Systems):
+        N = len(Systems[0].Elements)
+        if any(len(system.Elements) != N for system in Systems):
+            raise ValueError("Les variantes d'un ensemble doivent avoir le même nombre de corps")
+        if any(system.Particles for system in Systems):
+            raise ValueError("Les variantes d'un ensemble ne peuvent pas porter de particules test")
+        self.Systems = Systems  # Variantes du système
+        self.Positions = np.stack([system.Positions for system in Systems])  # (M,N,3) [km]
+        self.Velocities = np.stack([system.Velocities for system in Systems])  # (M,N,3) [km/s]
+        self.Forces = np.zeros_like(self.Positions)  # [N]
+        self.Masses = np.stack([system.Masses for system in Systems])  # (M,N) [kg]
+        self.Inertial_Masses = np.where(self.Masses > 0, self.Masses, 1.0)  # Masse nulle : force nulle, comme System [kg]
+        self.Radii = np.stack([system.Radii for system in Systems])  # [km]
+        self.Albedos = np.stack([system.Albedos for system in Systems])
+        self.Emissivities = np.stack([system.Emissivities for system in Systems])
+        self.Body_Temperatures = np.stack([system.Body_Temperatures for system in Systems])  # [K]
+        self.Thermic_Radiations = self.Body_Temperatures ** 4
+        self.Integrator = 'euler'
+        self.Force_Evaluations = 0  # Nombre de passes de forces (chacune sur tout l'ensemble)
+
+        # Paires non ordonnées (i < j) de chaque variante, numérotées dans l'état aplati (M*N,)
+        self.Pair_I, self.Pair_J = np.triu_indices(N, 1)
+        offsets = (np.arange(len(Systems)) * N)[:, None]
+        self.Flat_I, self.Flat_J = (offsets + self.Pair_I).ravel(), (offsets + self.Pair_J).ravel()
+
+        # Émetteurs de radiation : union de ceux des variantes, masqués variante par variante
+        self.Emitters = np.unique(np.concatenate([system.Emitters for system in Systems]))  # (S,)
+        self.Emitter_Mask = np.stack([np.isin(self.Emitters, system.Emitters) for system in Systems])  # (M,S)
+        self.Invalidate()
+
+    def Invalidate(self):
+        """
+        Signale que les positions ont changé : géométrie et forces sont à recalculer.
+        """
+        self.Geometry = None
+        self.Forces_Current = False
+
+    def Pair_Geometry(self):
+        """
+        Géométrie des paires de toutes les variantes : vecteurs séparation (M,P,3), distances et inverses des cubes.
+        """
+        dvec = (self.Positions[:, self.Pair_I] - self.Positions[:, self.Pair_J]) * 1e3  # Distances en mètres
+        dnorm = np.sqrt(np.einsum('mpk,mpk->mp', dvec, dvec))
+        self.Geometry = (dvec, dnorm, 1 / dnorm ** 3)
+
+    def Gravitation_law(self):
+        """
+        Calcule la force gravitationnelle agissant sur chaque corps de chaque variante.
+        """
+        if self.Forces_Current:
+            return
+        if self.Geometry is None:
+            self.Pair_Geometry()
+        self.Forces_Current = True
+        self.Force_Evaluations += 1
+
+        dvec, dnorm, inv3 = self.Geometry
+        force = ((G * self.Masses[:, self.Pair_I] * self.Masses[:, self.Pair_J] * inv3)[:, :, None] * dvec).reshape(-1, 3)
+        size = self.Masses.size
+        forces = self.Forces.reshape(-1, 3)
+        for axis in range(3):
+            forces[:, axis] = (np.bincount(self.Flat_J, force[:, axis], size)
+                               - np.bincount(self.Flat_I, force[:, axis], size))
+
+    def Thermic_Radiation_law(self):
+        """
+        Calcule la radiation thermique reçue par chaque corps de chaque variante de la part de ses émetteurs
+        (voir System.Classify_Emitters), sur la matrice (M, corps, émetteurs).
+        """
+        emission = ((self.Radii[:, self.Emitters] * 1e3) ** 2 * self.Body_Temperatures[:, self.Emitters] ** 4
+                    * self.Emitter_Mask)  # (M,S)
+        dvec = (self.Positions[:, :, None, :] - self.Positions[:, None, self.Emitters, :]) * 1e3  # (M,N,S,3)
+        dnorm2 = np.einsum('misk,misk->mis', dvec, dvec)
+        own = np.arange(self.Masses.shape[1])[:, None] == self.Emitters[None, :]
+        rad_sum = np.sum(np.where(own, 0, emission[:, None, :] / np.where(own, 1, dnorm2)), axis=2)
+        reflective = self.Albedos == 1.0  # Corps parfaitement réfléchissants (étoiles)
+        self.Thermic_Radiations[:] = np.where(reflective, self.Body_Temperatures ** 4,
+                                              (1 - self.Albedos) / (4 * self.Emissivities) * rad_sum)
+
+    def Accelerations(self):
+        """
+        Renvoie les accélérations gravitationnelles (M,N,3) aux positions actuelles [km/s2].
+        """
+        self.Gravitation_law()
+        return self.Forces / self.Inertial_Masses[:, :, None] / 1e3
+
+    def Transition(self, Time_step):
+        """
+        Met à jour la position, la vitesse et la température des corps de toutes les variantes
+        avec les schémas à pas fixe de System ('euler', 'leapfrog' ou 'yoshida4').
+        """
+        if self.Integrator == 'euler':
+            self.Velocities += Time_step * self.Forces / self.Inertial_Masses[:, :, None] / 1e3  # Vitesses en km/s
+            self.Positions += Time_step * self.Velocities
+            self.Invalidate()
+        elif self.Integrator == 'leapfrog':
+            self.Velocities += 0.5 * Time_step * self.Accelerations()
+            self.Positions += Time_step * self.Velocities
+            self.Invalidate()
+            self.Velocities += 0.5 * Time_step * self.Accelerations()
+        elif self.Integrator == 'yoshida4':
+            for kick, drift in zip(YOSHIDA_KICKS, YOSHIDA_DRIFTS + [None]):
+                self.Velocities += kick * Time_step * self.Accelerations()
+                if drift is not None:
+                    self.Positions += drift * Time_step * self.Velocities
+                    self.Invalidate()
+        else:
+            raise ValueError(f"Intégrateur non disponible pour un ensemble : {self.Integrator}")
+        self.Body_Temperatures[:] = self.Thermic_Radiations ** (1 / 4)
+
+    def Simulation(self, Time, Nb_step, integrator='euler', every=1, progress=True):
+        """
+        Lance la simulation de toutes les variantes pour une durée donnée, en enregistrant un pas sur every.
+        À la fin, chaque variante reçoit son état final et son historique (Trajectories, Temperatures, Time),
+        comme après son propre appel à System.Simulation. progress affiche une barre de progression (tqdm).
+        """
+        Time_step = Time / Nb_step
+        self.Integrator = integrator
+        self.Invalidate()
+        M, N = self.Masses.shape
+        nb_records = -(-Nb_step // every)
+        step = Time / YEAR / (Nb_step - 1) if Nb_step > 1 else 0.0
+        self.Time = np.arange(nb_records) * every * step  # Même axe que System.Record_Times
+        self.Trajectory_Data = np.zeros((M, N, 3, nb_records))  # Trajectoires (variante, corps, x/y/z, temps)
+        self.Temperature_Data = np.zeros((M, N, nb_records))  # Températures (variante, corps, temps)
+
+        steps = range(Nb_step)
+        if progress:
+            from tqdm import tqdm
+            steps = tqdm(steps)
+        for k in steps:
+            self.Gravitation_law()
+            self.Thermic_Radiation_law()
+            self.Transition(Time_step)
+            if k % every == 0:
+                self.Trajectory_Data[:, :, :, k // every] = self.Positions
+                self.Temperature_Data[:, :, k // every] = self.Body_Temperatures
+
+        # Restitution de l'état et de l'historique à chaque variante
+        for m, system in enumerate(self.Systems):
+            system.Positions[:], system.Velocities[:] = self.Positions[m], self.Velocities[m]
+            system.Forces[:] = self.Forces[m]
+            system.Body_Temperatures[:], system.Thermic_Radiations[:] = self.Body_Temperatures[m], self.Thermic_Radiations[m]
+            system.Invalidate()
+            system.Sync_Bodies()
+            system.Time = self.Time
+            system.Trajectory_Data, system.Temperature_Data = self.Trajectory_Data[m], self.Temperature_Data[m]
+            system.Link_Data()
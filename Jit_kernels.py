@@ -0,0 +1,93 @@
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+### NOYAUX COMPILES ###
+# Chaque corps i est traité par un seul fil (boucle prange), qui parcourt tous les autres corps j :
+# pas de tableau temporaire, pas d'écriture concurrente, résultats écrits en place.
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def Gravity_kernel(Positions, Masses, Inertial_Masses, Nb_bodies, Forces, G):
+        """
+        Force gravitationnelle [N] exercée sur chaque corps par les Nb_bodies corps massifs, placés en tête
+        (positions en km, constante gravitationnelle G en m3/kg/s2). Les particules test qui suivent
+        ont une masse inerte unité.
+        """
+        N = Positions.shape[0]
+        for i in numba.prange(N):
+            fx, fy, fz = 0.0, 0.0, 0.0
+            for j in range(Nb_bodies):
+                if j == i:
+                    continue
+                dx = (Positions[j, 0] - Positions[i, 0]) * 1e3  # Distances en mètres
+                dy = (Positions[j, 1] - Positions[i, 1]) * 1e3
+                dz = (Positions[j, 2] - Positions[i, 2]) * 1e3
+                dnorm2 = dx * dx + dy * dy + dz * dz
+                weight = Masses[j] / (dnorm2 * np.sqrt(dnorm2))
+                fx += weight * dx
+                fy += weight * dy
+                fz += weight * dz
+            Forces[i, 0] = G * Inertial_Masses[i] * fx
+            Forces[i, 1] = G * Inertial_Masses[i] * fy
+            Forces[i, 2] = G * Inertial_Masses[i] * fz
+
+    @numba.njit(parallel=True, cache=True)
+    def Radiation_kernel(Positions, Radii, Temperatures, Albedos, Emissivities, Emitters, Radiations):
+        """
+        Radiation thermique reçue par chaque corps (T⁴ équivalent) de la part des émetteurs d'indices Emitters,
+        comme System.Thermic_Radiation_law.
+        """
+        N = Positions.shape[0]
+        for i in numba.prange(N):
+            if Albedos[i] == 1.0:  # Corps parfaitement réfléchissant (étoile)
+                Radiations[i] = Temperatures[i] ** 4
+                continue
+            rad_sum = 0.0
+            for j in Emitters:
+                if j == i:
+                    continue
+                dx = (Positions[j, 0] - Positions[i, 0]) * 1e3
+                dy = (Positions[j, 1] - Positions[i, 1]) * 1e3
+                dz = (Positions[j, 2] - Positions[i, 2]) * 1e3
+                rad_sum += (Radii[j] * 1e3) ** 2 * Temperatures[j] ** 4 / (dx * dx + dy * dy + dz * dz)
+            Radiations[i] = (1 - Albedos[i]) / (4 * Emissivities[i]) * rad_sum
+
+    @numba.njit(parallel=True, cache=True)
+    def Block_kernel(Positions, Velocities, Masses, Nb_bodies, Index, Scales, Accelerations, Sums, G):
+        """
+        Accélération [km/s2] des corps d'indices Index sous l'effet des Nb_bodies corps massifs (G en km3/kg/s2)
+        et, avec Scales, sommes des normes des accélérations et des jerks de chaque paire, comme
+        System.Block_Forces.
+        """
+        for k in numba.prange(Index.shape[0]):
+            i = Index[k]
+            ax, ay, az, sa, sj = 0.0, 0.0, 0.0, 0.0, 0.0
+            for j in range(Nb_bodies):
+                if j == i:
+                    continue
+                dx = Positions[j, 0] - Positions[i, 0]
+                dy = Positions[j, 1] - Positions[i, 1]
+                dz = Positions[j, 2] - Positions[i, 2]
+                dnorm2 = dx * dx + dy * dy + dz * dz
+                weight = G * Masses[j] / (dnorm2 * np.sqrt(dnorm2))
+                ax += weight * dx
+                ay += weight * dy
+                az += weight * dz
+                if Scales:
+                    vx = Velocities[j, 0] - Velocities[i, 0]
+                    vy = Velocities[j, 1] - Velocities[i, 1]
+                    vz = Velocities[j, 2] - Velocities[i, 2]
+                    rv = 3 * (dx * vx + dy * vy + dz * vz) / dnorm2
+                    jx, jy, jz = vx - rv * dx, vy - rv * dy, vz - rv * dz
+                    sa += weight * np.sqrt(dnorm2)
+                    sj += weight * np.sqrt(jx * jx + jy * jy + jz * jz)
+            Accelerations[k, 0] = ax
+            Accelerations[k, 1] = ay
+            Accelerations[k, 2] = az
+            Sums[k, 0] = sa
+            Sums[k, 1] = sj
@@ -0,0 +1,110 @@
+import numpy as np
+
+### MOUVEMENT KEPLERIEN ###
+# Propagation analytique d'orbites à deux corps en variable universelle (valable pour les orbites
+# elliptiques, paraboliques et hyperboliques), vectorisée sur toutes les orbites à la fois.
+# Positions en km, vitesses en km/s, paramètre gravitationnel mu = G M en km3/s2.
+
+LAGUERRE_ORDER = 5  # Ordre de l'itération de Laguerre-Conway
+MAX_ITERATIONS = 50
+
+def Stumpff(z):
+    """
+    Fonctions de Stumpff C(z) et S(z), avec leur développement en série près de z = 0.
+    """
+    small = np.abs(z) < 1e-3
+    w = np.sqrt(np.abs(np.where(small, 1.0, z)))
+    C = np.where(z > 0, (1 - np.cos(w)) / w ** 2, (np.cosh(w) - 1) / w ** 2)
+    S = np.where(z > 0, (w - np.sin(w)) / w ** 3, (np.sinh(w) - w) / w ** 3)
+    C = np.where(small, 1 / 2 - z / 24 + z ** 2 / 720 - z ** 3 / 40320, C)
+    S = np.where(small, 1 / 6 - z / 120 + z ** 2 / 5040 - z ** 3 / 362880, S)
+    return C, S
+
+def Kepler_drift(Positions, Velocities, mu, dt):
+    """
+    Positions et vitesses (K,3) après une durée dt [s] sur les orbites képlériennes autour d'un centre fixe
+    de paramètre mu. L'équation de Kepler en variable universelle χ est résolue par l'itération de
+    Laguerre-Conway, qui converge quelle que soit la première estimation ; pour une orbite elliptique,
+    dt est d'abord ramené à moins d'une période.
+    """
+    r0 = np.sqrt(np.einsum('ik,ik->i', Positions, Positions))
+    v2 = np.einsum('ik,ik->i', Velocities, Velocities)
+    sigma0 = np.einsum('ik,ik->i', Positions, Velocities) / np.sqrt(mu)
+    alpha = 2 / r0 - v2 / mu  # Inverse du demi-grand axe [1/km]
+    bound = alpha > 0
+    period = 2 * np.pi / np.sqrt(mu * np.where(bound, alpha, 1.0) ** 3)
+    tau = np.where(bound, np.fmod(dt, period), dt)
+    target = np.sqrt(mu) * tau
+
+    # Premières estimations : elliptique, puis hyperbolique (Vallado) si elle est définie
+    chi = np.where(bound, np.sqrt(mu) * alpha * tau, target / r0)
+    a = 1 / np.where(bound | (alpha == 0), -1.0, alpha)  # Demi-grand axe des orbites hyperboliques [km]
+    ratio = -2 * mu * alpha * tau / (sigma0 * np.sqrt(mu) + np.sign(tau) * np.sqrt(-mu * a) * (1 - r0 * alpha))
+    hyperbolic = ~bound & (alpha < -1e-12 / r0) & (ratio > 0)
+    chi = np.where(hyperbolic, np.sign(tau) * np.sqrt(-a) * np.log(np.where(hyperbolic, ratio, 1.0)), chi)
+    n = LAGUERRE_ORDER
+    for _ in range(MAX_ITERATIONS):
+        z = alpha * chi ** 2
+        C, S = Stumpff(z)
+        F = sigma0 * chi ** 2 * C + (1 - alpha * r0) * chi ** 3 * S + r0 * chi - target
+        dF = sigma0 * chi * (1 - z * S) + (1 - alpha * r0) * chi ** 2 * C + r0  # Distance r [km]
+        d2F = sigma0 * (1 - z * C) + (1 - alpha * r0) * chi * (1 - z * S)
+        root = np.sqrt(np.abs((n - 1) ** 2 * dF ** 2 - n * (n - 1) * F * d2F))
+        delta = n * F / (dF + np.copysign(root, dF))
+        chi = chi - delta
+        if np.all(np.abs(delta) <= 1e-13 * np.maximum(np.abs(chi), 1e-300)):
+            break
+
+    z = alpha * chi ** 2
+    C, S = Stumpff(z)
+    f = 1 - chi ** 2 * C / r0
+    g = tau - chi ** 3 * S / np.sqrt(mu)
+    positions = f[:, None] * Positions + g[:, None] * Velocities
+    r = np.sqrt(np.einsum('ik,ik->i', positions, positions))
+    df = np.sqrt(mu) / (r * r0) * chi * (z * S - 1)
+    dg = 1 - chi ** 2 * C / r
+    velocities = df[:, None] * Positions + dg[:, None] * Velocities
+    return positions, velocities
+
+### ELEMENTS ORBITAUX ###
+def Anomalies(M, e):
+    """
+    Anomalie vraie [rad] à partir de l'anomalie moyenne M, par la méthode de Newton sur l'équation de Kepler
+    (elliptique, e < 1) ou sa forme hyperbolique (e > 1).
+    """
+    elliptic = e < 1
+    M = np.where(elliptic, np.remainder(M + np.pi, 2 * np.pi) - np.pi, M)
+    x = np.where(elliptic, np.where(e > 0.8, np.pi * np.sign(M), M), np.arcsinh(M / np.maximum(e, 1e-300)))
+    for _ in range(MAX_ITERATIONS):
+        f = np.where(elliptic, x - e * np.sin(x) - M, e * np.sinh(x) - x - M)
+        df = np.where(elliptic, 1 - e * np.cos(x), e * np.cosh(x) - 1)
+        delta = f / df
+        x = x - delta
+        if np.all(np.abs(delta) <= 1e-14 * np.maximum(np.abs(x), 1)):
+            break
+    elliptic_nu = 2 * np.arctan2(np.sqrt(1 + e) * np.sin(x / 2), np.sqrt(np.abs(1 - e)) * np.cos(x / 2))
+    hyperbolic_nu = 2 * np.arctan(np.sqrt((e + 1) / np.abs(e - 1)) * np.tanh(x / 2))
+    return np.where(elliptic, elliptic_nu, hyperbolic_nu)
+
+def Elements_to_state(a, e, i, Omega, omega, M, mu):
+    """
+    Positions [km] et vitesses [km/s] (K,3) relatives au corps central à partir des éléments képlériens :
+    demi-grand axe a [km] (négatif pour une orbite hyperbolique), excentricité e, inclinaison i,
+    longitude du noeud ascendant Omega, argument du périapse omega et anomalie moyenne M [rad],
+    avec le paramètre gravitationnel mu [km3/s2]. Toutes les orbites sont converties en une passe.
+    """
+    a, e, i, Omega, omega, M, mu = np.broadcast_arrays(*[np.asarray(x, dtype=np.float64)
+                                                         for x in (a, e, i, Omega, omega, M, mu)])
+    if np.any(np.abs(e - 1) < 1e-12):
+        raise ValueError("Les orbites paraboliques (e = 1) ne sont pas prises en charge")
+    nu = Anomalies(M, e)
+    p = np.abs(a * (1 - e ** 2))  # Paramètre de l'orbite [km]
+    r = p / (1 + e * np.cos(nu))
+    speed = np.sqrt(mu / p)
+    # Repère du périapse, puis rotations R3(-Omega) R1(-i) R3(-omega)
+    position = np.stack([r * np.cos(nu), r * np.sin(nu)], axis=-1)
+    velocity = np.stack([-speed * np.sin(nu), speed * (e + np.cos(nu))], axis=-1)
+    cO, sO, co, so, ci, si = np.cos(Omega), np.sin(Omega), np.cos(omega), np.sin(omega), np.cos(i), np.sin(i)
+    P = np.stack([cO * co - sO * so * ci, sO * co + cO * so * ci, so * si], axis=-1)  # Direction du périapse
+    Q = np.stack([-cO * so - sO * co * ci, -sO * so + cO * co * ci, co * si], axis=-1)
+    return (position[..., :1] * P + position[..., 1:] * Q, velocity[..., :1] * P + velocity[..., 1:] * Q)
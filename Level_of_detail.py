@@ -0,0 +1,226 @@
+import numpy as np
+from functools import lru_cache
+
+### NIVEAUX DE DETAIL ###
+# Chaque courbe est décimée une fois pour toutes en une pyramide de niveaux (indices triés de points conservés).
+# À chaque frame, on choisit le niveau le plus fin dont la fenêtre affichée tient dans le budget de sommets :
+# le coût d'une frame dépend du budget, plus du nombre de pas de la simulation.
+# Les sommets affichés vivent dans un tampon préalloué : d'une frame à la suivante, seuls les nouveaux points
+# sont copiés et les points expirés abandonnés, la fenêtre n'est reconstruite qu'au changement de niveau.
+# Les courbes (éventuellement projetées en mémoire depuis un Trajectory_Store) sont parcourues par tranches :
+# la préparation ne crée aucun temporaire de la longueur de l'historique.
+
+CHUNK = 65536  # Pas lus à la fois lors de la préparation des niveaux
+
+def Select_level(Levels, start, end, budget):
+    """
+    Niveau le plus fin dont la plage d'indices conservés dans [start, end) respecte le budget.
+    Renvoie (niveau, premier, dernier) : la plage est Levels[niveau][premier:dernier].
+    """
+    for level, indices in enumerate(Levels):
+        first, last = np.searchsorted(indices, [start, end])
+        if last - first <= budget:
+            return level, first, last
+    return level, first, last
+
+@lru_cache(maxsize=4)
+def Identity(T):
+    """
+    Niveau le plus fin (tous les points d'une courbe de T pas), en lecture seule et partagé entre les courbes.
+    """
+    indices = np.arange(T)
+    indices.flags.writeable = False
+    return indices
+
+def Segments(Trajectory, chunk=CHUNK):
+    """
+    Parcourt les segments d'une trajectoire (3,T) par tranches de chunk segments. Génère (p, longueurs, angles) :
+    longueurs des segments p + j -> p + j + 1 et angles de virage entre les segments p + j - 1 et p + j,
+    comptés au point p + j + 1 de la mesure cumulée (nul pour le premier segment).
+    """
+    T = Trajectory.shape[1]
+    for p in range(0, T - 1, chunk):
+        end = min(p + chunk, T - 1)
+        first = max(p - 1, 0)  # Segment précédent, pour l'angle du début de tranche
+        steps = np.diff(Trajectory[:, first:end + 1], axis=1)
+        lengths = np.linalg.norm(steps, axis=0)
+        dots = np.einsum('kt,kt->t', steps[:, :-1], steps[:, 1:])
+        norms = lengths[:-1] * lengths[1:]
+        angles = np.arccos(np.clip(dots / np.where(norms > 0, norms, 1), -1, 1)) * (norms > 0)
+        angles = np.concatenate([np.zeros(1 - (p - first)), angles])
+        yield p, lengths[p - first:], angles
+
+def Bucket_starts(measure, spacing, chunk=CHUNK):
+    """
+    Indices des premiers points de chaque paquet de largeur spacing d'une mesure cumulée croissante.
+    """
+    indices, previous = [], np.nan
+    for p in range(0, len(measure), chunk):
+        buckets = np.floor(measure[p:p + chunk] / spacing)
+        indices.append(p + np.flatnonzero(np.r_[buckets[0] != previous, buckets[1:] != buckets[:-1]]))
+        previous = buckets[-1]
+    return np.concatenate(indices)
+
+def Pair_extrema(indices, Values, better):
+    """
+    Extrema (au sens de better, à égalité le premier) des paquets consécutifs pris deux à deux,
+    chaque paquet étant représenté par l'indice indices de son extremum.
+    """
+    if len(indices) % 2:
+        indices = np.append(indices, indices[-1])
+    left, right = indices[0::2], indices[1::2]
+    return np.where(better(Values[left], Values[right]), left, right)
+
+### CLASS VERTEX_BUFFER ###
+class Vertex_Buffer:
+    """
+    Fenêtre glissante (D,k) sur les points conservés d'une pyramide de niveaux, dans un tableau préalloué.
+    Tant que le niveau ne change pas et que la fenêtre avance, une mise à jour ne copie que les nouveaux
+    points et déplace le début du tampon au-delà des points expirés.
+    """
+    def __init__(self, Source, Levels, budget):
+        self.Source = Source  # D lignes (T,) : tableau (D,T) ou séquence de tableaux
+        self.Levels = Levels
+        self.Budget = budget
+        self.Data = np.empty((len(Source), 2 * budget + 2), dtype=np.result_type(*[row.dtype for row in Source]))
+        self.Level = None
+        self.First = self.Last = 0  # Plage Levels[Level][First:Last] présente dans le tampon
+        self.Head = self.Tail = 0  # Colonnes occupées du tampon
+
+    def Update(self, start, end, closing=None):
+        """
+        Points conservés entre les pas start et end, suivis du point closing s'il est donné.
+        La vue renvoyée reste valide jusqu'à la mise à jour suivante.
+        """
+        level, first, last = Select_level(self.Levels, start, end, self.Budget)
+        if level != self.Level or first < self.First or last < self.Last or first >= self.Last:
+            # Changement de niveau, retour en arrière ou saut : reconstruction complète
+            self.Level, self.First, self.Last = level, first, first
+            self.Head = self.Tail = 0
+        self.Head += first - self.First  # Points expirés
+        self.First = first
+
+        new = last - self.Last
+        live = self.Tail - self.Head
+        if self.Tail + new + 1 > self.Data.shape[1]:
+            if live + new + 1 > self.Data.shape[1]:  # Niveau le plus grossier au-delà du budget
+                data = np.empty((self.Data.shape[0], 2 * (live + new + 1)), dtype=self.Data.dtype)
+                data[:, :live] = self.Data[:, self.Head:self.Tail]
+                self.Data = data
+            else:
+                self.Data[:, :live] = self.Data[:, self.Head:self.Tail]
+            self.Head, self.Tail = 0, live
+        indices = self.Levels[level][self.Last:last]
+        for row, source in zip(self.Data, self.Source):
+            row[self.Tail:self.Tail + new] = source[indices]
+        self.Tail += new
+        self.Last = last
+        if closing is None:
+            return self.Data[:, self.Head:self.Tail]
+        self.Data[:, self.Tail] = [source[closing] for source in self.Source]
+        return self.Data[:, self.Head:self.Tail + 1]
+
+### CLASS TRAIL_LOD ###
+class Trail_LOD:
+    """
+    Traînée 3D décimée selon la courbure : les points sont répartis uniformément selon une mesure qui cumule
+    la longueur d'arc et l'angle de virage, si bien que les passages rapprochés et les virages serrés
+    gardent plus de points que les portions rectilignes. La trajectoire est lue par tranches en deux passes
+    (totaux, puis mesure cumulée) : seule la mesure (T,) est allouée sur toute sa longueur.
+    """
+    def __init__(self, Trajectory, budget):
+        self.Trajectory = Trajectory  # (3,T) [km]
+        self.Budget = budget  # Nombre maximal de sommets affichés
+        T = Trajectory.shape[1]
+        # Longueur d'arc et angle de virage totaux, pour normaliser les deux termes de la mesure
+        arc_total = turn_total = 0.0
+        for p, lengths, angles in Segments(Trajectory):
+            arc_total += np.sum(lengths)
+            turn_total += np.sum(angles)
+        arc_total, turn_total = max(arc_total, 1e-300), max(turn_total, 1e-300)
+        measure = np.zeros(T)  # Mesure cumulée (croissante)
+        arc = turn = 0.0
+        for p, lengths, angles in Segments(Trajectory):
+            arcs, turns = arc + np.cumsum(lengths), turn + np.cumsum(angles)
+            measure[p + 1:p + 1 + len(lengths)] = arcs / arc_total + turns / turn_total
+            arc, turn = arcs[-1], turns[-1]
+
+        # Du plus fin (tous les points) au plus grossier (environ budget points sur toute la trajectoire)
+        self.Levels = [Identity(T)]
+        spacing = measure[-1] / max(budget, 1)
+        coarse = []
+        while spacing > 0:
+            indices = Bucket_starts(measure, spacing)
+            if len(indices) >= T / 2:
+                break
+            coarse.append(indices)
+            spacing /= 2
+        self.Levels += coarse[::-1]
+        self.Buffer = Vertex_Buffer(Trajectory, self.Levels, budget)
+
+    def Window(self, start, end):
+        """
+        Sommets (3,k) de la traînée entre les pas start et end, terminée exactement au pas end.
+        """
+        return self.Buffer.Update(start, end, closing=end)
+
+### CLASS SERIES_LOD ###
+class Series_LOD:
+    """
+    Courbe temporelle décimée par minimum et maximum : chaque paquet de pas est représenté par ses extrema,
+    ce qui préserve l'enveloppe de la courbe à toute échelle. Les extrema des paquets de taille 2s sont
+    déduits de ceux des paquets de taille s : chaque niveau ne coûte que le nombre de ses paquets.
+    """
+    def __init__(self, Time, Values, budget):
+        self.Time, self.Values = Time, Values
+        self.Budget = budget
+        T = len(Values)
+        self.Levels = [Identity(T)]
+        lows = highs = self.Levels[0]  # Indices des minima et maxima des paquets du niveau précédent
+        size = 2
+        while 2 * T / size > budget / 2 and size < T:
+            lows, highs = Pair_extrema(lows, Values, np.less_equal), Pair_extrema(highs, Values, np.greater_equal)
+            level = np.unique(np.concatenate([lows, highs]))
+            if len(level) < len(self.Levels[-1]):  # Niveau sans décimation (paquets de deux points) : inutile
+                self.Levels.append(level)
+            size *= 2
+        self.Buffer = Vertex_Buffer((Time, Values), self.Levels, budget)
+
+    def Window(self, end):
+        """
+        Points (temps, valeurs) de la courbe jusqu'au pas end exclu.
+        """
+        t_data, values = self.Buffer.Update(0, end)
+        return t_data, values
+
+### CLASS RING_BUFFER ###
+class Ring_Buffer:
+    """
+    Derniers capacity enregistrements d'un flux (..., T), dans l'ordre chronologique : chaque
+    enregistrement est écrit deux fois, aux colonnes i et i + capacity, si bien que la fenêtre est
+    toujours une vue contiguë du tableau préalloué. Le coût d'un ajout ne dépend que de sa taille.
+    """
+    def __init__(self, shape, capacity):
+        self.Data = np.empty(tuple(shape) + (2 * capacity,))
+        self.Capacity = capacity
+        self.Head = 0  # Colonne du plus ancien enregistrement
+        self.Size = 0
+
+    def Append(self, Values):
+        """
+        Ajoute les enregistrements Values (..., k) ; seuls les capacity derniers sont conservés.
+        """
+        Values = Values[..., -self.Capacity:]
+        k = Values.shape[-1]
+        columns = (self.Head + self.Size + np.arange(k)) % self.Capacity
+        self.Data[..., columns] = Values
+        self.Data[..., columns + self.Capacity] = Values
+        overflow = max(self.Size + k - self.Capacity, 0)  # Enregistrements les plus anciens écrasés
+        self.Head = (self.Head + overflow) % self.Capacity
+        self.Size = min(self.Size + k, self.Capacity)
+
+    def Window(self):
+        """
+        Vue (..., Size) des enregistrements conservés, du plus ancien au plus récent.
+        """
+        return self.Data[..., self.Head:self.Head + self.Size]
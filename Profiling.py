@@ -0,0 +1,61 @@
+import time
+
+PHASES = ['Gravitation_law', 'Thermic_Radiation_law', 'Transition', 'Save_Data']  # Phases d'un pas
+
+### CLASS PROFILER ###
+class Profiler:
+    """
+    Mesure le nombre d'appels et le temps propre de chaque phase d'un pas de simulation : le temps d'une phase
+    appelée par une autre (Gravitation_law dans Transition avec les intégrateurs d'ordre élevé) n'est compté
+    que pour elle. Après chaque appel, hook(phase, secondes, pas) est appelé pour chaque hook de hooks.
+    Attach remplace les méthodes du système par des versions chronométrées et Detach rétablit les méthodes
+    de la classe : sans profileur, la boucle de simulation n'est pas modifiée.
+    """
+    def __init__(self, hooks=()):
+        self.Hooks = list(hooks)  # Fonctions hook(phase, secondes, pas)
+        self.Calls = dict.fromkeys(PHASES, 0)
+        self.Seconds = dict.fromkeys(PHASES, 0.0)  # Temps propre cumulé [s]
+        self.Stack = []  # Temps des phases imbriquées dans chaque phase en cours
+
+    def Attach(self, System):
+        self.System = System
+        for phase in PHASES:
+            setattr(System, phase, self.Wrap(phase, getattr(System, phase)))
+
+    def Detach(self):
+        for phase in PHASES:
+            vars(self.System).pop(phase, None)
+
+    def Wrap(self, phase, method):
+        """
+        Version chronométrée de la méthode liée method.
+        """
+        clock, stack, hooks = time.perf_counter, self.Stack, self.Hooks
+
+        def timed(*args):
+            stack.append(0.0)
+            start = clock()
+            try:
+                return method(*args)
+            finally:
+                elapsed = clock() - start
+                own = elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                self.Seconds[phase] += own
+                self.Calls[phase] += 1
+                for hook in hooks:
+                    hook(phase, own, getattr(self.System, 'Step', None))
+        return timed
+
+    def Report(self):
+        """
+        Affiche, pour chaque phase, le nombre d'appels, le temps cumulé, le temps moyen par pas et la part du total.
+        """
+        steps = max(self.Calls['Save_Data'], 1)
+        total = sum(self.Seconds.values())
+        print(f"{'Phase':<22} {'Appels':>9} {'Total [s]':>10} {'Par pas [us]':>13} {'Part':>6}")
+        for phase in PHASES:
+            share = self.Seconds[phase] / total if total > 0 else 0.0
+            print(f"{phase:<22} {self.Calls[phase]:>9} {self.Seconds[phase]:>10.3f} "
+                  f"{self.Seconds[phase] / steps * 1e6:>13.1f} {share:>6.1%}")
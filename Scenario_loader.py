@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import sys
+import time
+import numpy as np
+from Astronomic_objects import Body, Particles, System, G
+from Kepler import Elements_to_state
+
+### SCENARIOS DECLARATIFS ###
+# Un scénario (JSON ou TOML) décrit les corps par leurs éléments képlériens relatifs à un parent :
+#
+#   [Units]                      # Facultatif : Distance 'au' (défaut) ou 'km', Angle 'deg' (défaut) ou 'rad'
+#   [[Bodies]]                   # Corps massifs ; sans Parent, Position [Distance] et Velocity [km/s] (défaut 0)
+#   Name, Mass, Radius, Temperature, Albedo, Emissivity, Color, Emitter (facultatif)
+#   Parent = "Sun"
+#   Elements = { a, e, i, Omega, omega, M }
+#   [[Populations]]              # Particules test autour d'un corps
+#   Name, Parent, Count, Seed, Radius, Temperature, Albedo, Emissivity, Color
+#   Elements = { a = [...], e = { Uniform = [0, 0.2] }, i = { Rayleigh = 5 }, ... }
+#
+# Un élément de population est un nombre, une liste de Count valeurs ou une loi Uniform [min, max],
+# Normal [moyenne, écart type] ou Rayleigh échelle. Les orbites sont converties par niveau de la hiérarchie
+# en une passe vectorisée, et l'état initial est conservé dans un cache indexé par l'empreinte du fichier.
+
+AU = 1.496e8  # 1 Unité Astronomique en kilomètres (km)
+DISTANCES = {'au': AU, 'km': 1.0}
+ANGLES = {'deg': np.pi / 180, 'rad': 1.0}
+ELEMENTS = ('a', 'e', 'i', 'Omega', 'omega', 'M')
+CACHE_VERSION = 1  # À incrémenter si la conversion change, pour invalider les caches existants
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'Astronomic-Objects', 'scenarios')  # Cache par défaut, hors de l'arborescence du projet
+
+def Read_scenario(data, suffix):
+    """
+    Décode le contenu d'un fichier de scénario selon son extension.
+    """
+    if suffix == '.json':
+        return json.loads(data)
+    if suffix == '.toml':
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        return tomllib.loads(data.decode('utf-8'))
+    raise ValueError(f"Format de scénario inconnu : {suffix} (JSON ou TOML)")
+
+def Draw(value, count, rng):
+    """
+    Valeurs (count,) d'un élément de population : constante, liste explicite ou loi de probabilité.
+    """
+    if isinstance(value, dict):
+        (law, parameters), = value.items()
+        if law == 'Uniform':
+            return rng.uniform(*parameters, count)
+        if law == 'Normal':
+            return rng.normal(*parameters, count)
+        if law == 'Rayleigh':
+            return rng.rayleigh(parameters, count)
+        raise ValueError(f"Loi inconnue : {law}")
+    values = np.asarray(value, dtype=np.float64)
+    if values.ndim and len(values) != count:
+        raise ValueError(f"{len(values)} valeurs données pour {count} particules")
+    return np.broadcast_to(values, (count,))
+
+def Scale(elements, units):
+    """
+    Éléments (a, e, i, Omega, omega, M) convertis en km et en radians.
+    """
+    distance, angle = DISTANCES[units.get('Distance', 'au')], ANGLES[units.get('Angle', 'deg')]
+    a, e, i, Omega, omega, M = elements
+    return a * distance, e, i * angle, Omega * angle, omega * angle, M * angle
+
+def Body_states(bodies, units):
+    """
+    Positions et vitesses absolues (B,3) des corps : les racines sont placées directement, puis chaque
+    niveau de la hiérarchie (planètes, lunes...) est converti en une passe autour de parents déjà placés.
+    """
+    index = {body['Name']: k for k, body in enumerate(bodies)}
+    missing = [body['Parent'] for body in bodies if 'Parent' in body and body['Parent'] not in index]
+    if missing:
+        raise ValueError(f"Parents inconnus : {', '.join(missing)}")
+    B = len(bodies)
+    parents = np.array([index[body['Parent']] if 'Parent' in body else -1 for body in bodies], dtype=int)
+    masses = np.array([body['Mass'] for body in bodies], dtype=np.float64)
+    positions, velocities = np.zeros((B, 3)), np.zeros((B, 3))
+    for k in np.flatnonzero(parents < 0):
+        positions[k] = np.asarray(bodies[k].get('Position', (0.0, 0.0, 0.0))) * DISTANCES[units.get('Distance', 'au')]
+        velocities[k] = bodies[k].get('Velocity', (0.0, 0.0, 0.0))
+
+    placed = parents < 0
+    while not np.all(placed):
+        batch = np.flatnonzero(~placed & placed[np.maximum(parents, 0)])
+        if not len(batch):
+            raise ValueError("La hiérarchie des parents contient un cycle")
+        elements = np.array([[bodies[k]['Elements'][name] for name in ELEMENTS] for k in batch], dtype=np.float64).T
+        mu = G * 1e-9 * (masses[parents[batch]] + masses[batch])  # Problème à deux corps [km3/s2]
+        x, v = Elements_to_state(*Scale(elements, units), mu)
+        positions[batch] = positions[parents[batch]] + x
+        velocities[batch] = velocities[parents[batch]] + v
+        placed[batch] = True
+    return positions, velocities
+
+def Convert(scenario):
+    """
+    Métadonnées (scénario sans les éléments des populations) et tableaux d'état initiaux du scénario.
+    """
+    units = scenario.get('Units', {})
+    bodies = scenario.get('Bodies', [])
+    populations = scenario.get('Populations', [])
+    positions, velocities = Body_states(bodies, units)
+    arrays = {'Body_Positions': positions, 'Body_Velocities': velocities}
+    index = {body['Name']: k for k, body in enumerate(bodies)}
+
+    for k, population in enumerate(populations):
+        if population['Parent'] not in index:
+            raise ValueError(f"Parent inconnu : {population['Parent']}")
+        parent = index[population['Parent']]
+        lengths = {len(value) for value in population['Elements'].values() if isinstance(value, list)}
+        count = population.get('Count', max(lengths, default=1))
+        rng = np.random.default_rng(population.get('Seed', 0))
+        elements = [Draw(population['Elements'][name], count, rng) for name in ELEMENTS]
+        x, v = Elements_to_state(*Scale(elements, units), G * 1e-9 * bodies[parent]['Mass'])
+        arrays[f'Positions_{k}'] = positions[parent] + x
+        arrays[f'Velocities_{k}'] = velocities[parent] + v
+
+    meta = {'Bodies': bodies, 'Populations': [{key: value for key, value in population.items() if key != 'Elements'}
+                                              for population in populations]}
+    return meta, arrays
+
+def Scenario_state(Path, cache=True, cache_dir=None):
+    """
+    Métadonnées et état initial du scénario Path. Avec cache, l'état converti est relu depuis
+    cache_dir (par défaut CACHE_DIR) tant que le contenu du fichier ne change pas : ni décodage ni
+    conversion ne sont alors refaits.
+    """
+    with open(Path, 'rb') as file:
+        data = file.read()
+    stem, suffix = os.path.splitext(os.path.basename(Path))
+    stem = f"{stem}-{hashlib.sha256(os.path.abspath(Path).encode()).hexdigest()[:8]}"  # Un cache par fichier
+    digest = hashlib.sha256(f'{CACHE_VERSION}:'.encode())
+    digest.update(data)
+    digest = digest.hexdigest()[:16]
+    cache_dir = cache_dir or CACHE_DIR
+    cache_path = os.path.join(cache_dir, f'{stem}-{digest}.npz')
+
+    if cache and os.path.exists(cache_path):
+        with np.load(cache_path) as stored:
+            arrays = {key: stored[key] for key in stored.files if key != 'Meta'}
+            return json.loads(str(stored['Meta'])), arrays
+
+    meta, arrays = Convert(Read_scenario(data, suffix.lower()))
+    if cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        for name in os.listdir(cache_dir):  # Caches périmés du même scénario
+            if name.startswith(f'{stem}-') and name.endswith('.npz'):
+                os.remove(os.path.join(cache_dir, name))
+        np.savez(cache_path, Meta=np.array(json.dumps(meta)), **arrays)
+    return meta, arrays
+
+def Load_scenario(Path, cache=True, cache_dir=None, **options):
+    """
+    Crée le System décrit par le scénario Path ; les options sont transmises à System (engine, backend...).
+    """
+    meta, arrays = Scenario_state(Path, cache, cache_dir)
+    bodies = [Body(Name=spec['Name'], Position=position, Velocity=velocity, Mass=spec['Mass'], Radius=spec['Radius'],
+                   Temperature=spec['Temperature'], Albedo=spec['Albedo'], Emissivity=spec['Emissivity'],
+                   Color=spec['Color'], Emitter=spec.get('Emitter'))
+              for spec, position, velocity in zip(meta['Bodies'], arrays['Body_Positions'], arrays['Body_Velocities'])]
+    particles = [Particles(Name=spec['Name'], Positions=arrays[f'Positions_{k}'], Velocities=arrays[f'Velocities_{k}'],
+                           Radius=spec['Radius'], Temperature=spec['Temperature'], Albedo=spec['Albedo'],
+                           Emissivity=spec['Emissivity'], Color=spec['Color'])
+                 for k, spec in enumerate(meta['Populations'])]
+    return System(bodies, particles=particles, **options)
+
+### CHARGEMENT D'UN SCENARIO ###
+
+if __name__ == '__main__':
+    for path in sys.argv[1:] or [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Scenarios', 'Solar_system.toml')]:
+        start = time.perf_counter()
+        system = Load_scenario(path)
+        nb_particles = sum(len(population) for population in system.Particles)
+        print(f"{path} : {len(system.Bodies)} corps et {nb_particles} particules test chargés en "
+              f"{(time.perf_counter() - start) * 1e3:.1f} ms")
@@ -0,0 +1,103 @@
+import queue
+import threading
+import numpy as np
+
+### CLASS SINK ###
+class Sink:
+    """
+    Destination de l'historique d'une simulation en flux (System.Simulation(..., sink=...)).
+    Open est appelée avant le premier bloc, Write pour chaque bloc et Close à la fin de la simulation.
+    Les tableaux reçus par Write sont réutilisés par la simulation : il faut les copier pour les conserver.
+    """
+    def Open(self, System, Time, Nb_step, every):
+        """
+        Début de la simulation de System sur Time [s] en Nb_step pas, dont un sur every est transmis.
+        """
+        self.Names = [element.Name for element in System.Elements]
+
+    def Write(self, Time, Trajectories, Temperatures):
+        """
+        Reçoit un bloc : temps [années] (T,), trajectoires [km] (corps, x/y/z, T), températures [K] (corps, T).
+        """
+        raise NotImplementedError
+
+    def Resume(self, System, Time, Nb_step, every, Records):
+        """
+        Reprise d'une simulation interrompue : les Records premiers enregistrements sont déjà écrits.
+        """
+        raise NotImplementedError(f"{type(self).__name__} ne permet pas de reprendre une simulation")
+
+    def Flush(self):
+        """
+        Rend durable ce qui a été écrit jusqu'ici (appelée avant chaque checkpoint).
+        """
+        pass
+
+    def Close(self):
+        pass
+
+### CLASS MEMORY_SINK ###
+class Memory_Sink(Sink):
+    """
+    Conserve en mémoire l'historique reçu (typiquement décimé), sous la même forme que System.Trajectories
+    et System.Temperatures.
+    """
+    def Open(self, System, Time, Nb_step, every):
+        super().Open(System, Time, Nb_step, every)
+        self.Blocks = []
+
+    def Write(self, Time, Trajectories, Temperatures):
+        self.Blocks.append((Time.copy(), Trajectories.copy(), Temperatures.copy()))
+
+    def Close(self):
+        self.Time = np.concatenate([block[0] for block in self.Blocks])
+        trajectories = np.concatenate([block[1] for block in self.Blocks], axis=2)
+        temperatures = np.concatenate([block[2] for block in self.Blocks], axis=1)
+        self.Trajectories = dict(zip(self.Names, trajectories))
+        self.Temperatures = dict(zip(self.Names, temperatures))
+        self.Blocks = []
+
+### CLASS CALLBACK_SINK ###
+class Callback_Sink(Sink):
+    """
+    Transmet chaque bloc à une fonction callback(Time, Trajectories, Temperatures), par exemple pour
+    calculer des statistiques au fil de l'eau sans rien conserver.
+    """
+    def __init__(self, callback):
+        self.Callback = callback
+
+    def Write(self, Time, Trajectories, Temperatures):
+        self.Callback(Time, Trajectories, Temperatures)
+
+### CLASS QUEUE_SINK ###
+class Queue_Sink(Sink):
+    """
+    Transmet chaque bloc (copié) à un consommateur d'un autre fil d'exécution, via une file bornée à
+    maxsize blocs : quand la file est pleine, Write attend, ce qui ralentit la simulation au rythme
+    du consommateur. Close ajoute None en fin de file. Stop() interrompt la simulation en attente.
+    """
+    def __init__(self, maxsize=8):
+        self.Queue = queue.Queue(maxsize)
+        self.Stopped = threading.Event()
+
+    def Put(self, item):
+        """
+        Ajoute item à la file dès qu'une place se libère ; lève InterruptedError après Stop().
+        """
+        while not self.Stopped.is_set():
+            try:
+                self.Queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise InterruptedError("Simulation interrompue par le consommateur")
+
+    def Write(self, Time, Trajectories, Temperatures):
+        self.Put((Time.copy(), Trajectories.copy(), Temperatures.copy()))
+
+    def Close(self):
+        if not self.Stopped.is_set():
+            self.Put(None)
+
+    def Stop(self):
+        self.Stopped.set()
@@ -1,5 +1,5 @@
 import numpy as np
-from Astronomic_objects import Body, System
+from Astronomic_objects import Body, Particles, System
 
 ### CONSTANTES ###
 G = 6.67430e-11  # Constante gravitationnelle (m^3/kg/s^2)
@@ -29,21 +29,8 @@ def apply_inclination(position, velocity, inclination_deg):
     
     return rotated_position, rotated_velocity
 
-### DEFINITION DES CORPS ###
-
-# Soleil
-Soleil = Body(Name='Sun',
-              Position=np.array([[0.0], [0.0], [0.0]]),  # Soleil au centre
-              Velocity=np.array([[0.0], [0.0], [0.0]]),  # Soleil immobile
-              Mass=MS,
-              Radius=696340,
-              Temperature=5778,  # Température moyenne du Soleil
-              Albedo=1.0,
-              Emissivity=0.95,
-              Color='gold')
-
 # Inclinaisons des orbites des planètes en degrés (par rapport à l'écliptique)
-inclinations = {
+INCLINATIONS = {
     'Mercure': 7.0,
     'Vénus': 3.39,
     'Terre': 0.0,
@@ -68,46 +55,87 @@ planets_params = {
     'Pluton': {'distance': 39.48, 'mass': 1.309e22, 'radius': 1188.3, 'temperature': 44, 'color': 'brown'}  # Optionnel
 }
 
-### CREATION DES PLANETES ###
+### DEFINITION DES CORPS ###
+
+def Asteroid_Belt(nb, inner=2.1, outer=3.3, max_inclination=10.0, seed=0):
+    """
+    Ceinture principale de nb astéroïdes (particules test) sur des orbites circulaires entre inner et outer [AU],
+    de phases aléatoires et d'inclinaisons au plus max_inclination [degrés].
+    """
+    rng = np.random.default_rng(seed)
+    radius = rng.uniform(inner, outer, nb) * AU
+    phase = rng.uniform(0, 2 * np.pi, nb)
+    node = rng.uniform(0, 2 * np.pi, nb)
+    inclination = np.radians(rng.uniform(-max_inclination, max_inclination, nb))
+    # Orbite dans le plan de l'écliptique, inclinée autour de la ligne des noeuds
+    u = np.stack([np.cos(node), np.sin(node), np.zeros(nb)], axis=1)
+    w = np.stack([-np.sin(node) * np.cos(inclination), np.cos(node) * np.cos(inclination), np.sin(inclination)], axis=1)
+    positions = radius[:, None] * (np.cos(phase)[:, None] * u + np.sin(phase)[:, None] * w)
+    velocities = orbital_velocity(MS, radius)[:, None] * (-np.sin(phase)[:, None] * u + np.cos(phase)[:, None] * w)
+    return Particles(Name='Asteroids', Positions=positions, Velocities=velocities, Radius=1.0,
+                     Temperature=170, Albedo=0.1, Emissivity=0.9, Color='silver')
 
-planets = []
+def Create_System(inclinations=INCLINATIONS, asteroids=0):
+    """
+    Crée le système solaire (Soleil et planètes), avec les inclinaisons données [degrés]
+    et, si asteroids > 0, une ceinture d'astéroïdes de ce nombre de particules test.
+    """
+    # Soleil
+    Soleil = Body(Name='Sun',
+                  Position=np.array([0.0, 0.0, 0.0]),  # Soleil au centre
+                  Velocity=np.array([0.0, 0.0, 0.0]),  # Soleil immobile
+                  Mass=MS,
+                  Radius=696340,
+                  Temperature=5778,  # Température moyenne du Soleil
+                  Albedo=1.0,
+                  Emissivity=0.95,
+                  Color='gold')
+
+    ### CREATION DES PLANETES ###
+
+    planets = []
 
-for planet_name, params in planets_params.items():
-    distance_au = params['distance']
-    distance_km = distance_au * AU
-    mass = params['mass']
-    radius = params['radius']
-    temperature = params['temperature']
-    color = params['color']
-    inclination = inclinations.get(planet_name, 0.0)
+    for planet_name, params in planets_params.items():
+        distance_au = params['distance']
+        distance_km = distance_au * AU
+        mass = params['mass']
+        radius = params['radius']
+        temperature = params['temperature']
+        color = params['color']
+        inclination = inclinations.get(planet_name, 0.0)
     
-    # Position et vitesse initiales dans le plan de l'écliptique
-    position = np.array([[distance_km], [0.0], [0.0]])
-    velocity = np.array([[0.0], [orbital_velocity(MS, distance_km)], [0.0]])
+        # Position et vitesse initiales dans le plan de l'écliptique
+        position = np.array([distance_km, 0.0, 0.0])
+        velocity = np.array([0.0, orbital_velocity(MS, distance_km), 0.0])
     
-    # Appliquer l'inclinaison
-    position, velocity = apply_inclination(position, velocity, inclination)
+        # Appliquer l'inclinaison
+        position, velocity = apply_inclination(position, velocity, inclination)
     
-    # Création de l'objet planète
-    planet = Body(Name=planet_name,
-                  Position=position,
-                  Velocity=velocity,
-                  Mass=mass,
-                  Radius=radius,
-                  Temperature=temperature,
-                  Albedo=0.3,
-                  Emissivity=0.95,
-                  Color=color)
+        # Création de l'objet planète
+        planet = Body(Name=planet_name,
+                      Position=position,
+                      Velocity=velocity,
+                      Mass=mass,
+                      Radius=radius,
+                      Temperature=temperature,
+                      Albedo=0.3,
+                      Emissivity=0.95,
+                      Color=color)
     
-    planets.append(planet)
+        planets.append(planet)
+
+    # Inclure le Soleil et les planètes dans le système
+    belt = [Asteroid_Belt(asteroids)] if asteroids else []
+    solar_system = System([Soleil] + planets, particles=belt)
+    return solar_system
 
 ### SIMULATION DU SYSTEME SOLAIRE ###
 
-# Inclure le Soleil et les planètes dans le système
-solar_system = System([Soleil] + planets)
+if __name__ == '__main__':
+    solar_system = Create_System()
 
-# Simulation sur 1 an avec 10000 étapes pour une précision adéquate
-solar_system.Simulation(Time=250 * YEAR, Nb_step=10000)
+    # Simulation sur 1 an avec 10000 étapes pour une précision adéquate
+    solar_system.Simulation(Time=250 * YEAR, Nb_step=10000)
 
-# Animation du système sur 10 secondes
-solar_system.Animation(Animated_time=60, trail = 0.02, anim_temps=False, fixed = 5)
+    # Animation du système sur 10 secondes
+    solar_system.Animation(Animated_time=60, trail = 0.02, anim_temps=False, fixed = 5)
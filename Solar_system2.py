@@ -31,21 +31,8 @@ def apply_inclination(position, velocity, inclination_deg):
     
     return rotated_position, rotated_velocity
 
-### DEFINITION DES CORPS ###
-
-# Soleil
-Soleil = Body(Name='Sun',
-              Position=np.array([[0.0], [0.0], [0.0]]),  # Soleil au centre
-              Velocity=np.array([[0.0], [0.0], [0.0]]),  # Soleil immobile
-              Mass=MS,
-              Radius=696340,
-              Temperature=5778,  # Température moyenne du Soleil
-              Albedo=1.0,
-              Emissivity=0.95,
-              Color='gold')
-
 # Inclinaisons des orbites des planètes en degrés (par rapport à l'écliptique)
-inclinations = {
+INCLINATIONS = {
     'Mercure': 7.0,
     'Vénus': 3.39,
     'Terre': 0.0,
@@ -70,110 +57,132 @@ planets_params = {
     'Pluton': {'distance': 39.48, 'mass': 1.309e22, 'radius': 1188.3, 'temperature': 44, 'color': 'brown'}  # Optionnel
 }
 
-### CREATION DES PLANETES ###
+### DEFINITION DES CORPS ###
 
-planets = []
+def Create_System(inclinations=INCLINATIONS):
+    """
+    Crée le système solaire avec la Lune et les lunes galiléennes, avec les inclinaisons
+    des planètes données [degrés].
+    """
+    # Soleil
+    Soleil = Body(Name='Sun',
+                  Position=np.array([0.0, 0.0, 0.0]),  # Soleil au centre
+                  Velocity=np.array([0.0, 0.0, 0.0]),  # Soleil immobile
+                  Mass=MS,
+                  Radius=696340,
+                  Temperature=5778,  # Température moyenne du Soleil
+                  Albedo=1.0,
+                  Emissivity=0.95,
+                  Color='gold')
 
-for planet_name, params in planets_params.items():
-    distance_au = params['distance']
-    distance_km = distance_au * AU
-    mass = params['mass']
-    radius = params['radius']
-    temperature = params['temperature']
-    color = params['color']
-    inclination = inclinations.get(planet_name, 0.0)
+    ### CREATION DES PLANETES ###
+
+    planets = []
+
+    for planet_name, params in planets_params.items():
+        distance_au = params['distance']
+        distance_km = distance_au * AU
+        mass = params['mass']
+        radius = params['radius']
+        temperature = params['temperature']
+        color = params['color']
+        inclination = inclinations.get(planet_name, 0.0)
     
-    # Position et vitesse initiales dans le plan de l'écliptique
-    position = np.array([[distance_km], [0.0], [0.0]])
-    velocity = np.array([[0.0], [orbital_velocity(MS, distance_km)], [0.0]])
+        # Position et vitesse initiales dans le plan de l'écliptique
+        position = np.array([distance_km, 0.0, 0.0])
+        velocity = np.array([0.0, orbital_velocity(MS, distance_km), 0.0])
     
-    # Appliquer l'inclinaison
-    position, velocity = apply_inclination(position, velocity, inclination)
+        # Appliquer l'inclinaison
+        position, velocity = apply_inclination(position, velocity, inclination)
     
-    # Création de l'objet planète
-    planet = Body(Name=planet_name,
-                  Position=position,
-                  Velocity=velocity,
-                  Mass=mass,
-                  Radius=radius,
-                  Temperature=temperature,
-                  Albedo=0.3,
-                  Emissivity=0.95,
-                  Color=color)
+        # Création de l'objet planète
+        planet = Body(Name=planet_name,
+                      Position=position,
+                      Velocity=velocity,
+                      Mass=mass,
+                      Radius=radius,
+                      Temperature=temperature,
+                      Albedo=0.3,
+                      Emissivity=0.95,
+                      Color=color)
     
-    planets.append(planet)
-
-### AJOUT DE LA LUNE ET DES LUNES DE JUPITER ###
-
-# Lune de la Terre
-moon_distance_km = 384400  # Distance Terre-Lune en km
-moon_velocity_km_s = orbital_velocity(EARTH_MASS, moon_distance_km)
-moon_inclination = 5.14  # Inclinaison orbitale de la Lune par rapport à l'écliptique
-
-# Position et vitesse de la Lune par rapport à la Terre
-moon_position = np.array([[moon_distance_km], [0.0], [0.0]])
-moon_velocity = np.array([[0.0], [moon_velocity_km_s], [0.0]])
-
-# Appliquer l'inclinaison à la Lune
-moon_position, moon_velocity = apply_inclination(moon_position, moon_velocity, moon_inclination)
-
-Lune = Body(Name='Moon',
-            Position=planets[2].Position + moon_position,  # Terre + Lune
-            Velocity=planets[2].Velocity + moon_velocity,  # Terre + Lune
-            Mass=7.34767309e22,
-            Radius=1737.4,
-            Temperature=273,
-            Albedo=0.12,
-            Emissivity=0.95,
-            Color='lightgray')
-
-# Lunes galiléennes de Jupiter
-jupiter_moons_params = {
-    'Io': {'distance': 421700, 'mass': 8.9319e22, 'radius': 1821.6, 'inclination': 0.05, 'color': 'gold'},
-    'Europe': {'distance': 671034, 'mass': 4.7998e22, 'radius': 1560.8, 'inclination': 0.47, 'color': 'lightblue'},
-    'Ganymede': {'distance': 1070400, 'mass': 1.4819e23, 'radius': 2634.1, 'inclination': 0.2, 'color': 'gray'},
-    'Callisto': {'distance': 1882700, 'mass': 1.0759e23, 'radius': 2410.3, 'inclination': 0.28, 'color': 'darkgray'}
-}
+        planets.append(planet)
 
-jupiter_moons = []
+    ### AJOUT DE LA LUNE ET DES LUNES DE JUPITER ###
 
-for moon_name, params in jupiter_moons_params.items():
-    moon_distance_km = params['distance']
-    moon_mass = params['mass']
-    moon_radius = params['radius']
-    moon_inclination = params['inclination']
-    moon_color = params['color']
+    # Lune de la Terre
+    moon_distance_km = 384400  # Distance Terre-Lune en km
+    moon_velocity_km_s = orbital_velocity(EARTH_MASS, moon_distance_km)
+    moon_inclination = 5.14  # Inclinaison orbitale de la Lune par rapport à l'écliptique
+
+    # Position et vitesse de la Lune par rapport à la Terre
+    moon_position = np.array([moon_distance_km, 0.0, 0.0])
+    moon_velocity = np.array([0.0, moon_velocity_km_s, 0.0])
+
+    # Appliquer l'inclinaison à la Lune
+    moon_position, moon_velocity = apply_inclination(moon_position, moon_velocity, moon_inclination)
+
+    Lune = Body(Name='Moon',
+                Position=planets[2].Position + moon_position,  # Terre + Lune
+                Velocity=planets[2].Velocity + moon_velocity,  # Terre + Lune
+                Mass=7.34767309e22,
+                Radius=1737.4,
+                Temperature=273,
+                Albedo=0.12,
+                Emissivity=0.95,
+                Color='lightgray')
+
+    # Lunes galiléennes de Jupiter
+    jupiter_moons_params = {
+        'Io': {'distance': 421700, 'mass': 8.9319e22, 'radius': 1821.6, 'inclination': 0.05, 'color': 'gold'},
+        'Europe': {'distance': 671034, 'mass': 4.7998e22, 'radius': 1560.8, 'inclination': 0.47, 'color': 'lightblue'},
+        'Ganymede': {'distance': 1070400, 'mass': 1.4819e23, 'radius': 2634.1, 'inclination': 0.2, 'color': 'gray'},
+        'Callisto': {'distance': 1882700, 'mass': 1.0759e23, 'radius': 2410.3, 'inclination': 0.28, 'color': 'darkgray'}
+    }
+
+    jupiter_moons = []
+
+    for moon_name, params in jupiter_moons_params.items():
+        moon_distance_km = params['distance']
+        moon_mass = params['mass']
+        moon_radius = params['radius']
+        moon_inclination = params['inclination']
+        moon_color = params['color']
     
-    # Calcul de la vitesse orbitale
-    moon_velocity_km_s = orbital_velocity(JUPITER_MASS, moon_distance_km)
+        # Calcul de la vitesse orbitale
+        moon_velocity_km_s = orbital_velocity(JUPITER_MASS, moon_distance_km)
     
-    # Position et vitesse de la lune par rapport à Jupiter
-    moon_position = np.array([[moon_distance_km], [0.0], [0.0]])
-    moon_velocity = np.array([[0.0], [moon_velocity_km_s], [0.0]])
+        # Position et vitesse de la lune par rapport à Jupiter
+        moon_position = np.array([moon_distance_km, 0.0, 0.0])
+        moon_velocity = np.array([0.0, moon_velocity_km_s, 0.0])
     
-    # Appliquer l'inclinaison
-    moon_position, moon_velocity = apply_inclination(moon_position, moon_velocity, moon_inclination)
+        # Appliquer l'inclinaison
+        moon_position, moon_velocity = apply_inclination(moon_position, moon_velocity, moon_inclination)
     
-    # Création de l'objet lune
-    moon = Body(Name=moon_name,
-                Position=planets[4].Position + moon_position,  # Jupiter + lune
-                Velocity=planets[4].Velocity + moon_velocity,  # Jupiter + lune
-                Mass=moon_mass,
-                Radius=moon_radius,
-                Temperature=100,
-                Albedo=0.3,
-                Emissivity=0.95,
-                Color=moon_color)
+        # Création de l'objet lune
+        moon = Body(Name=moon_name,
+                    Position=planets[4].Position + moon_position,  # Jupiter + lune
+                    Velocity=planets[4].Velocity + moon_velocity,  # Jupiter + lune
+                    Mass=moon_mass,
+                    Radius=moon_radius,
+                    Temperature=100,
+                    Albedo=0.3,
+                    Emissivity=0.95,
+                    Color=moon_color)
     
-    jupiter_moons.append(moon)
+        jupiter_moons.append(moon)
+
+    # Inclure le Soleil, les planètes, la Lune et les lunes de Jupiter dans le système
+    solar_system = System([Soleil] + planets + [Lune] + jupiter_moons)
+    return solar_system
 
 ### SIMULATION DU SYSTEME SOLAIRE ###
 
-# Inclure le Soleil, les planètes, la Lune et les lunes de Jupiter dans le système
-solar_system = System([Soleil] + planets + [Lune] + jupiter_moons)
+if __name__ == '__main__':
+    solar_system = Create_System()
 
-# Simulation sur 1 an avec 10000 étapes pour une précision adéquate
-solar_system.Simulation(Time=10 * YEAR, Nb_step=10000)
+    # Simulation sur 1 an avec 10000 étapes pour une précision adéquate
+    solar_system.Simulation(Time=10 * YEAR, Nb_step=10000)
 
-# Animation du système sur 10 secondes
-solar_system.Animation(Animated_time=60, trail = 0.02, anim_temps=False, fixed = 0)
+    # Animation du système sur 10 secondes
+    solar_system.Animation(Animated_time=60, trail = 0.02, anim_temps=False, fixed = 0)
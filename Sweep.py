@@ -0,0 +1,98 @@
+import os
+import itertools
+import numpy as np
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from Conservation import Energy
+
+def Grid(**axes):
+    """
+    Produit cartésien des valeurs données pour chaque paramètre : liste de dictionnaires de paramètres.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+### METRIQUES ###
+# Chaque métrique reçoit le système simulé et son état initial (positions, vitesses et masses) et renvoie un nombre.
+
+def Active_rows(system):
+    """
+    Lignes de l'historique des corps non absorbés lors d'une collision (voir Encounters) : un corps absorbé
+    y suit le corps qui l'a absorbé.
+    """
+    return np.array([k for k, element in enumerate(system.Elements) if element.Host is None])
+
+def Energy_drift(system, start):
+    """
+    Variation relative de l'énergie mécanique entre le début et la fin de la simulation.
+    """
+    initial = Energy(start['Positions'], start['Velocities'], start['Masses'])
+    return abs(Energy(system.Positions, system.Velocities, system.Masses) - initial) / abs(initial)
+
+def Min_separation(system, start):
+    """
+    Plus petite distance entre deux corps sur l'historique enregistré [km].
+    """
+    trajectories = system.Trajectory_Data[Active_rows(system)]
+    i, j = np.triu_indices(len(trajectories), 1)
+    return float(np.min(np.linalg.norm(trajectories[i] - trajectories[j], axis=1)))
+
+def Max_distance(system, start):
+    """
+    Plus grande distance d'un corps au barycentre sur l'historique enregistré [km].
+    """
+    rows = Active_rows(system)
+    masses = np.array([system.Elements[k].Mass for k in rows])
+    trajectories = system.Trajectory_Data[rows]
+    barycentre = np.einsum('i,ikt->kt', masses / np.sum(masses), trajectories)
+    return float(np.max(np.linalg.norm(trajectories - barycentre, axis=1)))
+
+METRICS = {'energy_drift': Energy_drift, 'min_separation': Min_separation, 'max_distance': Max_distance}
+
+### BALAYAGE ###
+def Run_One(factory, params, Time, Nb_step, options, metrics, name, shape, row):
+    """
+    Simule un jeu de paramètres dans un processus du pool et écrit ses métriques à la ligne row
+    du tampon partagé name : seules les métriques quittent le processus, pas les trajectoires.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        results = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+        system = factory(**params)
+        start = {'Positions': system.Positions.copy(), 'Velocities': system.Velocities.copy(),
+                 'Masses': system.Masses.copy()}
+        system.Simulation(Time, Nb_step, **{'progress': False, **options})  # Pas de barre par simulation
+        results[row] = [metric(system, start) for metric in metrics.values()]
+        del results
+    finally:
+        memory.close()
+    return row
+
+def Sweep(factory, grid, Time, Nb_step, metrics=METRICS, workers=None, progress=True, **options):
+    """
+    Lance factory(**params) puis Simulation(Time, Nb_step, **options) pour chaque jeu de paramètres de grid
+    (voir Grid), répartis sur workers processus (tous les coeurs par défaut). factory doit être une fonction
+    définie au niveau d'un module, comme Create_System dans les scénarios. progress affiche l'avancement
+    du balayage (tqdm) ; les simulations elles-mêmes n'affichent pas de barre.
+    Renvoie un dictionnaire nom de métrique -> tableau des valeurs, dans l'ordre de grid.
+    """
+    shape = (len(grid), len(metrics))
+    memory = shared_memory.SharedMemory(create=True, size=max(8 * shape[0] * shape[1], 1))
+    try:
+        results = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+        results[:] = np.nan
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            futures = [executor.submit(Run_One, factory, params, Time, Nb_step, options, metrics, memory.name, shape, row)
+                       for row, params in enumerate(grid)]
+            done = as_completed(futures)
+            if progress:
+                from tqdm import tqdm
+                done = tqdm(done, total=len(futures))
+            for future in done:
+                future.result()
+        summary = {metric: results[:, k].copy() for k, metric in enumerate(metrics)}
+        del results
+    finally:
+        memory.close()
+        memory.unlink()
+    return summary
@@ -0,0 +1,96 @@
+import json
+import numpy as np
+from Sinks import Sink
+
+### CONSTANTES ###
+MAGIC = b'ASTROTRJ'  # Signature du format
+VERSION = 1
+ALIGN = 4096  # Les données commencent sur une frontière de page
+FIELDS = ['x', 'y', 'z', 'temperature']  # Champs enregistrés pour chaque corps ([km] et [K])
+
+### FORMAT ###
+# MAGIC (8 octets) | longueur de l'en-tête (uint64) | en-tête JSON complété par des espaces jusqu'à ALIGN
+# | axe des temps : Nb_records float64 [années]
+# | pour chaque corps, pour chaque champ de FIELDS : Nb_records float64 contigus
+# Les données forment donc un tableau (corps, champ, temps) en ordre C, ouvert tel quel par np.memmap.
+
+def Header_size(header):
+    """
+    Taille en octets de la zone d'en-tête (signature, longueur et JSON), alignée sur ALIGN.
+    """
+    return -(-(16 + len(json.dumps(header).encode())) // ALIGN) * ALIGN
+
+def Read_header(Path):
+    """
+    Lit l'en-tête JSON d'un fichier de trajectoires et renvoie (en-tête, position des données).
+    """
+    with open(Path, 'rb') as file:
+        if file.read(8) != MAGIC:
+            raise ValueError(f"{Path} n'est pas un fichier de trajectoires")
+        length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+        header = json.loads(file.read(length).decode())
+    return header, Header_size(header)
+
+def Open_store(Path, mode='c'):
+    """
+    Ouvre un fichier de trajectoires sans le charger : renvoie l'en-tête, l'axe des temps (T,) [années]
+    et les données (corps, champ, T) sous forme de np.memmap. Le mode 'c' (copie à l'écriture) permet
+    de modifier les tableaux en mémoire sans toucher au fichier.
+    """
+    header, offset = Read_header(Path)
+    T, N = header['Nb_records'], len(header['Bodies'])
+    time = np.memmap(Path, dtype=np.float64, mode=mode, offset=offset, shape=(T,))
+    data = np.memmap(Path, dtype=np.float64, mode=mode, offset=offset + 8 * T, shape=(N, len(FIELDS), T))
+    return header, time, data
+
+### CLASS TRAJECTORY_STORE ###
+class Trajectory_Store(Sink):
+    """
+    Sink écrivant l'historique d'une simulation dans un fichier colonne par colonne :
+    un bloc float64 contigu par corps et par champ, précédé d'un en-tête décrivant les corps et l'axe des temps.
+    Le fichier est relu avec System.Load_Data ou System.From_Store sans relancer la simulation.
+    """
+    def __init__(self, Path):
+        self.Path = Path
+
+    def Open(self, System, Time, Nb_step, every):
+        super().Open(System, Time, Nb_step, every)
+        nb_records = -(-Nb_step // every)
+        header = {'Version': VERSION, 'Fields': FIELDS, 'Nb_records': nb_records,
+                  'Time': Time, 'Nb_step': Nb_step, 'Every': every, 'Engine': System.Engine,
+                  'Bodies': [{'Name': element.Name,
+                              'Position': element.Position.tolist(),
+                              'Velocity': element.Velocity.tolist(),
+                              'Mass': float(element.Mass), 'Radius': float(element.Radius),
+                              'Temperature': float(element.Temperature), 'Albedo': float(element.Albedo),
+                              'Emissivity': float(element.Emissivity), 'Color': element.Color}
+                             for element in System.Elements]}
+        text = json.dumps(header).encode()
+        offset = Header_size(header)
+        with open(self.Path, 'wb') as file:
+            file.write(MAGIC + np.uint64(len(text)).tobytes() + text.ljust(offset - 16))
+            file.truncate(offset + 8 * nb_records * (1 + len(System.Elements) * len(FIELDS)))
+        _, self.Times, self.Data = Open_store(self.Path, mode='r+')
+        self.Written = 0  # Nombre d'enregistrements déjà écrits
+
+    def Resume(self, System, Time, Nb_step, every, Records):
+        super().Open(System, Time, Nb_step, every)
+        header, self.Times, self.Data = Open_store(self.Path, mode='r+')
+        if header['Nb_records'] != -(-Nb_step // every) or [body['Name'] for body in header['Bodies']] != self.Names:
+            raise ValueError(f"{self.Path} ne correspond pas à la simulation reprise")
+        self.Written = Records
+
+    def Write(self, Time, Trajectories, Temperatures):
+        block = slice(self.Written, self.Written + len(Time))
+        self.Times[block] = Time
+        self.Data[:, :3, block] = Trajectories
+        self.Data[:, 3, block] = Temperatures
+        self.Written += len(Time)
+
+    def Flush(self):
+        self.Times.flush()
+        self.Data.flush()
+
+    def Close(self):
+        self.Flush()
+        del self.Times, self.Data  # Ferme les projections du fichier